@@ -0,0 +1,77 @@
+import dataclasses
+import tracemalloc
+import typing
+
+import ruiner
+from tests.test_generative import Line, Syntax
+
+
+@dataclasses.dataclass(frozen=True)
+class Workload:
+    lines: int = 10
+    params: int = 1
+    depth: int = 1
+    items: int = 10
+    optional: int = 0
+    width: int = 8
+
+    def name(self, level: int):
+        return f"Level_{level}"
+
+    def slot(self, line: int, param: int):
+        return Line(
+            expression=Syntax.param,
+            name=f"p_{line}_{param}",
+            other_left="<td>" if param else "<td>" + "." * self.width,
+            flag=Syntax.optional if param < self.optional else "",
+            other_right="</td>",
+        )
+
+    def line(self, line: int):
+        return "    " + "".join(str(self.slot(line, param)) for param in range(self.params))
+
+    def source(self, level: int):
+        lines = [self.line(line) for line in range(self.lines)]
+        if level < self.depth:
+            lines.append(str(Line(expression=Syntax.ref, name=self.name(level + 1), other_left="    ")))
+        return "<div>\n" + "\n".join(lines) + "\n</div>"
+
+    @property
+    def templates(self):
+        return {self.name(level): self.source(level) for level in range(self.depth + 1)}
+
+    def values(self, level: int) -> ruiner.TemplateParameters:
+        value = [str(level) * self.width] * self.items
+        return {
+            f"p_{line}_{param}": value
+            for line in range(self.lines)
+            for param in range(self.params)
+            if param >= self.optional or line % 2
+        }
+
+    @property
+    def parameters(self):
+        parameters = self.values(self.depth)
+        for level in reversed(range(self.depth)):
+            parameters = {**self.values(level), self.name(level + 1): parameters}
+        return parameters
+
+
+def peak(function: typing.Callable[[], typing.Any]):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+sweeps = {
+    "lines": [1, 10, 100, 1000],
+    "params": [1, 2, 4, 8],
+    "depth": [1, 10, 100],
+    "items": [1, 10, 100, 1000],
+    "optional": [1, 2, 4],
+    "width": [8, 64, 512],
+}
+dimensions = [(dimension, value) for dimension, values in sweeps.items() for value in values]
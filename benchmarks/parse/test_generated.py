@@ -0,0 +1,20 @@
+import dataclasses
+
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+from benchmarks.generated import Workload, dimensions, peak
+
+
+@pytest.mark.parametrize(("dimension", "value"), dimensions)
+def test_generated(benchmark: fixture.BenchmarkFixture, dimension: str, value: int):
+    workload = dataclasses.replace(Workload(params=8), **{dimension: value})
+    sources = workload.templates
+    benchmark.group = f"parse {dimension}"
+    benchmark.extra_info[dimension] = value
+    benchmark.extra_info["size"] = sum(map(len, sources.values()))
+    benchmark.extra_info["peak"] = peak(lambda: [ruiner.Template(s) for s in sources.values()])
+
+    templates = benchmark(lambda: [ruiner.Template(s) for s in sources.values()])
+    assert [t.value for t in templates] == list(sources.values())
@@ -0,0 +1,42 @@
+import pathlib
+import shutil
+
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+
+
+@pytest.fixture
+def root(tmp_path: pathlib.Path):
+    result = tmp_path / "templates"
+    result.mkdir()
+    for i in range(2000):
+        (result / f"Component_{i}.html").write_text(
+            "\n".join(
+                f"<div class=<!-- (param)class_{j} -->><!-- (optional)(ref)Component_{i + 1} --></div>"
+                for j in range(20)
+            )
+        )
+    return result
+
+
+def load(root: pathlib.Path, cache: "pathlib.Path | None"):
+    loader = ruiner.TemplateLoader(root, cache)
+    return [loader[name] for name in loader]
+
+
+def test_cold(benchmark: fixture.BenchmarkFixture, root: pathlib.Path):
+    benchmark(load, root, None)
+
+
+def test_warm(benchmark: fixture.BenchmarkFixture, root: pathlib.Path, tmp_path: pathlib.Path):
+    load(root, tmp_path / "cache")
+    benchmark(load, root, tmp_path / "cache")
+
+
+def test_first(benchmark: fixture.BenchmarkFixture, root: pathlib.Path, tmp_path: pathlib.Path):
+    def setup():
+        shutil.rmtree(tmp_path / "cache", ignore_errors=True)
+
+    benchmark.pedantic(load, (root, tmp_path / "cache"), setup=setup, rounds=5)
@@ -0,0 +1,25 @@
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+
+
+@pytest.mark.parametrize("megabytes", [1, 4])
+def test_large(benchmark: fixture.BenchmarkFixture, megabytes: int):
+    line = "<tr><td><!-- (param)a --></td><td><!-- (optional)(param)b --></td></tr>\n    <!-- (ref)Row -->\n"
+    source = line * (megabytes * 2**20 // len(line))
+    benchmark.extra_info["bytes"] = len(source)
+
+    template = benchmark(ruiner.Template, source)
+    assert len(template.tree.lines) == 2 * source.count(line) + 1
+
+
+@pytest.mark.parametrize(
+    "fragment", ["<!--", "<!-- ", "<!-- (optional)", "<!-- (optional)(param)", "<!-- (param)a ", "<!-- (param)a --"]
+)
+def test_adversarial(benchmark: fixture.BenchmarkFixture, fragment: str):
+    source = fragment * (2**20 // len(fragment))
+    benchmark.extra_info["fragment"] = fragment
+
+    template = benchmark(ruiner.Template, source)
+    assert template.tree == ruiner.Template(source).tree
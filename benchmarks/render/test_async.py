@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+
+
+@pytest.fixture
+def table():
+    return ruiner.Template("<table>\n    <!-- (ref)Row -->\n</table>")
+
+
+@pytest.fixture
+def templates() -> ruiner.Templates:
+    return {"Row": ruiner.Template("<tr>\n    <td><!-- (param)cell --></td>\n</tr>")}
+
+
+@pytest.fixture
+def rows() -> "list[ruiner.TemplateParameters]":
+    return [{"cell": [str(i) for i in range(10)]} for _ in range(10000)]
+
+
+async def produced(rows: "list[ruiner.TemplateParameters]"):
+    for row in rows:
+        yield row
+
+
+@pytest.mark.parametrize("mode", ["rendered", "arendered", "produced"])
+def test_async(
+    benchmark: fixture.BenchmarkFixture,
+    table: ruiner.Template,
+    templates: ruiner.Templates,
+    rows: "list[ruiner.TemplateParameters]",
+    mode: str,
+):
+    functions = {
+        "rendered": lambda: table.rendered({"Row": rows}, templates),
+        "arendered": lambda: asyncio.run(table.arendered({"Row": rows}, templates)),
+        "produced": lambda: asyncio.run(table.arendered({"Row": produced(rows)}, templates)),
+    }
+    benchmark.extra_info["mode"] = mode
+    assert benchmark(functions[mode]) == table.rendered({"Row": rows}, templates)
@@ -0,0 +1,53 @@
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+
+
+@pytest.fixture
+def templates() -> ruiner.Templates:
+    return {
+        "Header": ruiner.Template("<header>\n    <a><!-- (param)link --></a>\n</header>"),
+        "Asset": ruiner.Template('<script src="<!-- (param)url -->"></script>'),
+        "Row": ruiner.Template("<tr>\n    <td><!-- (param)cell --></td>\n</tr>"),
+    }
+
+
+@pytest.fixture
+def page():
+    return ruiner.Template(
+        "<title><!-- (param)site --></title>\n"
+        "<!-- (ref)Asset -->\n"
+        "<!-- (ref)Header -->\n"
+        "<table>\n"
+        "    <!-- (ref)Row -->\n"
+        "</table>"
+    )
+
+
+@pytest.fixture
+def constant() -> ruiner.TemplateParameters:
+    return {
+        "site": "site",
+        "Asset": [{"url": f"/static/{i}.js"} for i in range(50)],
+        "Header": {"link": [f"link {i}" for i in range(200)]},
+    }
+
+
+@pytest.mark.parametrize("mode", ["merged", "bound"])
+def test_bind(
+    benchmark: fixture.BenchmarkFixture,
+    templates: ruiner.Templates,
+    page: ruiner.Template,
+    constant: ruiner.TemplateParameters,
+    mode: str,
+):
+    dynamic: ruiner.TemplateParameters = {"Row": [{"cell": ["1", "2"]}]}
+    expected = page.rendered({**dynamic, **constant}, templates)
+    benchmark.extra_info["mode"] = mode
+
+    if mode == "bound":
+        result = benchmark(page.bind(constant, templates).rendered, dynamic, templates)
+    else:
+        result = benchmark(lambda: page.rendered({**dynamic, **constant}, templates))
+    assert result == expected
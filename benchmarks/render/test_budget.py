@@ -0,0 +1,45 @@
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+
+
+@pytest.fixture
+def templates() -> ruiner.Templates:
+    return {
+        "Section": ruiner.Template("<section>\n    <!-- (ref)Navigation -->\n    <!-- (ref)Row -->\n</section>"),
+        "Navigation": ruiner.Template("<nav>\n    <a><!-- (param)link --></a>\n</nav>"),
+        "Row": ruiner.Template("<tr>\n    <td><!-- (param)cell --></td>\n</tr>"),
+    }
+
+
+@pytest.fixture
+def parameters() -> ruiner.TemplateParameters:
+    return {
+        "Section": [
+            {
+                "Navigation": {"link": [f"link {i}" for i in range(20)]},
+                "Row": [{"cell": [str(j) for j in range(10)]} for _ in range(10)],
+            }
+            for _ in range(100)
+        ]
+    }
+
+
+@pytest.mark.parametrize("limited", ["off", "on"])
+def test_budget(
+    benchmark: fixture.BenchmarkFixture,
+    templates: ruiner.Templates,
+    parameters: ruiner.TemplateParameters,
+    limited: str,
+):
+    page = ruiner.Template("<body>\n    <!-- (ref)Section -->\n</body>")
+    budgets = {
+        "off": lambda: None,
+        "on": lambda: ruiner.Budget(size=1 << 30, expansions=1 << 20, depth=100, seconds=60),
+    }
+    expected = page.rendered(parameters, templates)
+    benchmark.extra_info["limited"] = limited
+
+    result = benchmark(lambda: page.rendered(parameters, templates, budget=budgets[limited]()))
+    assert result == expected
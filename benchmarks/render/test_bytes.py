@@ -0,0 +1,42 @@
+import tracemalloc
+
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+
+
+@pytest.fixture
+def table():
+    return ruiner.Template("<table>\n    <!-- (ref)Row -->\n</table>")
+
+
+@pytest.fixture
+def templates() -> ruiner.Templates:
+    return {"Row": ruiner.Template("<tr>\n    <td><!-- (param)cell --></td>\n</tr>")}
+
+
+@pytest.fixture
+def parameters() -> ruiner.TemplateParameters:
+    return {"Row": [{"cell": [str(i) for i in range(10)]} for _ in range(10000)]}
+
+
+@pytest.mark.parametrize("mode", ["encoded", "bytes"])
+def test_bytes(
+    benchmark: fixture.BenchmarkFixture,
+    table: ruiner.Template,
+    templates: ruiner.Templates,
+    parameters: ruiner.TemplateParameters,
+    mode: str,
+):
+    functions = {
+        "encoded": lambda: table.rendered(parameters, templates).encode(),
+        "bytes": lambda: table.rendered_bytes(parameters, templates),
+    }
+    tracemalloc.start()
+    expected = functions[mode]()
+    benchmark.extra_info["peak"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    benchmark.extra_info["size"] = len(expected)
+
+    assert benchmark(functions[mode]) == expected
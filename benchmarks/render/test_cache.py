@@ -0,0 +1,40 @@
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+
+
+@pytest.fixture
+def templates() -> ruiner.Templates:
+    return {
+        "Section": ruiner.Template("<section>\n    <!-- (ref)Navigation -->\n    <!-- (ref)Row -->\n</section>"),
+        "Navigation": ruiner.Template("<nav>\n    <a><!-- (param)link --></a>\n</nav>"),
+        "Row": ruiner.Template("<tr>\n    <td><!-- (param)cell --></td>\n</tr>"),
+    }
+
+
+@pytest.fixture
+def parameters() -> ruiner.TemplateParameters:
+    return {
+        "Section": [
+            {
+                "Navigation": {"link": [f"link {i}" for i in range(20)]},
+                "Row": [{"cell": [str(j) for j in range(10)]} for _ in range(10)],
+            }
+            for _ in range(100)
+        ]
+    }
+
+
+@pytest.mark.parametrize("cached", ["none", "render", "shared"])
+def test_cache(
+    benchmark: fixture.BenchmarkFixture, templates: ruiner.Templates, parameters: ruiner.TemplateParameters, cached: str
+):
+    page = ruiner.Template("<body>\n    <!-- (ref)Section -->\n</body>")
+    shared = ruiner.Cache()
+    caches = {"none": lambda: None, "render": ruiner.Cache, "shared": lambda: shared}
+    expected = page.rendered(parameters, templates)
+    benchmark.extra_info["cached"] = cached
+
+    result = benchmark(lambda: page.rendered(parameters, templates, cache=caches[cached]()))
+    assert result == expected
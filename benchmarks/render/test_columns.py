@@ -0,0 +1,17 @@
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+
+
+@pytest.mark.parametrize("columns", [2, 10, 50])
+def test_columns(benchmark: fixture.BenchmarkFixture, columns: int):
+    rows = 100000
+    template = ruiner.Template("<tr>" + "".join(f"<td><!-- (param)cell_{i} --></td>" for i in range(columns)) + "</tr>")
+    cells = [str(i) for i in range(rows)]
+    parameters: ruiner.TemplateParameters = {f"cell_{i}": cells for i in range(columns)}
+    benchmark.extra_info["columns"] = columns
+    benchmark.extra_info["rows"] = rows
+
+    result = benchmark.pedantic(template.rendered, (parameters,), rounds=3)
+    assert result.count("\n") == rows - 1
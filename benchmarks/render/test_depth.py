@@ -0,0 +1,24 @@
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+
+
+def nested(depth: int, lines: int):
+    templates: ruiner.Templates = {
+        f"Level_{i}": ruiner.Template(f"<div>\n    <!-- (ref)Level_{i + 1} -->\n</div>") for i in range(depth)
+    }
+    templates[f"Level_{depth}"] = ruiner.Template("<!-- (param)line -->")
+    parameters: ruiner.TemplateParameters = {"line": [str(i) for i in range(lines)]}
+    for i in reversed(range(depth)):
+        parameters = {f"Level_{i + 1}": parameters}
+    return templates, parameters
+
+
+@pytest.mark.parametrize("depth", [1, 5, 10, 20, 50, 100, 1000])
+def test_depth(benchmark: fixture.BenchmarkFixture, depth: int):
+    templates, parameters = nested(depth, 1000)
+    benchmark.extra_info["depth"] = depth
+
+    result = benchmark(templates["Level_0"].rendered, parameters, templates)
+    assert result.count("\n") == 1000 + 2 * depth - 1
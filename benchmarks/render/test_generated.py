@@ -0,0 +1,22 @@
+import dataclasses
+
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+from benchmarks.generated import Workload, dimensions, peak
+
+
+@pytest.mark.parametrize(("dimension", "value"), dimensions)
+def test_generated(benchmark: fixture.BenchmarkFixture, dimension: str, value: int):
+    workload = dataclasses.replace(Workload(params=8), **{dimension: value})
+    templates = {name: ruiner.Template(source) for name, source in workload.templates.items()}
+    parameters = workload.parameters
+    root = templates[workload.name(0)]
+    expected = root.rendered(parameters, templates)
+    benchmark.group = f"render {dimension}"
+    benchmark.extra_info[dimension] = value
+    benchmark.extra_info["size"] = len(expected)
+    benchmark.extra_info["peak"] = peak(lambda: root.rendered(parameters, templates))
+
+    assert benchmark(root.rendered, parameters, templates) == expected
@@ -0,0 +1,47 @@
+import itertools
+
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+
+
+@pytest.fixture
+def templates() -> ruiner.Templates:
+    return {
+        "Section": ruiner.Template("<section>\n    <!-- (ref)Row -->\n</section>"),
+        "Row": ruiner.Template("<tr>\n    <td><!-- (param)cell --></td>\n</tr>"),
+    }
+
+
+@pytest.fixture
+def sections() -> "list[ruiner.TemplateParameters]":
+    return [{"Row": [{"cell": [str(j) for j in range(10)]} for _ in range(10)]} for _ in range(100)]
+
+
+@pytest.mark.parametrize("mode", ["full", "incremental"])
+def test_incremental(
+    benchmark: fixture.BenchmarkFixture,
+    templates: ruiner.Templates,
+    sections: "list[ruiner.TemplateParameters]",
+    mode: str,
+):
+    page = ruiner.Template("<body>\n    <!-- (ref)Section -->\n</body>")
+    incremental = ruiner.Incremental(page, templates)
+    counter = itertools.count()
+    last: "list[ruiner.TemplateParameters]" = []
+    benchmark.extra_info["mode"] = mode
+
+    def changed() -> ruiner.TemplateParameters:
+        i = next(counter)
+        result = sections.copy()
+        result[i % len(result)] = {"Row": [{"cell": [str(i)]}]}
+        last[:] = [{"Section": result}]
+        return last[0]
+
+    functions = {
+        "full": lambda: page.rendered(changed(), templates),
+        "incremental": lambda: incremental.rendered(changed()),
+    }
+    result = benchmark(functions[mode])
+    assert result == page.rendered(last[0], templates)
@@ -0,0 +1,24 @@
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+
+
+@pytest.mark.parametrize("lines", [10, 100, 1000, 10000])
+def test_lines(benchmark: fixture.BenchmarkFixture, lines: int):
+    template = ruiner.Template("\n".join(f"<td><!-- (param)cell_{i} --></td>" for i in range(lines)))
+    parameters: ruiner.TemplateParameters = {f"cell_{i}": str(i) for i in range(lines)}
+    benchmark.extra_info["lines"] = lines
+
+    result = benchmark(template.rendered, parameters)
+    assert result.count("\n") == lines - 1
+
+
+@pytest.mark.parametrize("number", [10, 100, 1000, 10000])
+def test_templates(benchmark: fixture.BenchmarkFixture, number: int):
+    templates: ruiner.Templates = {f"Cell_{i}": ruiner.Template(f"<td>{i}</td>") for i in range(number)}
+    table = ruiner.Template("\n".join(f"<!-- (ref)Cell_{i} -->" for i in range(number)))
+    benchmark.extra_info["lines"] = number
+
+    result = benchmark(table.rendered, {}, templates)
+    assert result.count("\n") == number - 1
@@ -0,0 +1,45 @@
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+
+
+@pytest.fixture
+def invoice():
+    return ruiner.Template(
+        "<h1>Invoice for <!-- (param)customer --></h1>\n" "<table>\n" "    <!-- (ref)Item -->\n" "</table>"
+    )
+
+
+@pytest.fixture
+def templates():
+    return {"Item": ruiner.Template("<tr><td><!-- (param)name --></td><td><!-- (param)price --></td></tr>")}
+
+
+@pytest.fixture
+def parameters() -> "list[ruiner.TemplateParameters]":
+    return [
+        {"customer": f"customer {i}", "Item": [{"name": f"item {j}", "price": str(j * 10)} for j in range(10)]}
+        for i in range(10000)
+    ]
+
+
+def test_loop(
+    benchmark: fixture.BenchmarkFixture,
+    invoice: ruiner.Template,
+    templates: ruiner.Templates,
+    parameters: "list[ruiner.TemplateParameters]",
+):
+    benchmark(lambda: [invoice.rendered(p, templates) for p in parameters])
+
+
+@pytest.mark.parametrize("workers", [None, 4])
+def test_render_many(
+    benchmark: fixture.BenchmarkFixture,
+    invoice: ruiner.Template,
+    templates: ruiner.Templates,
+    parameters: "list[ruiner.TemplateParameters]",
+    workers: "int | None",
+):
+    result = benchmark(lambda: list(invoice.render_many(parameters, templates, workers=workers)))
+    assert result == [invoice.rendered(p, templates) for p in parameters]
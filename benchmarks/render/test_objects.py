@@ -0,0 +1,69 @@
+import collections
+import dataclasses
+import typing
+
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+
+
+@dataclasses.dataclass(frozen=True)
+class Item:
+    name: str
+    price: str
+
+
+@dataclasses.dataclass(frozen=True)
+class Invoice:
+    customer: str
+    Item: "list[Item]"
+
+
+class Slotted:
+    __slots__ = ("name", "price")
+
+    def __init__(self, name: str, price: str):
+        self.name = name
+        self.price = price
+
+
+Pair = collections.namedtuple("Pair", ["name", "price"])
+
+
+@pytest.fixture
+def invoice():
+    return ruiner.Template(
+        "<h1>Invoice for <!-- (param)customer --></h1>\n" "<table>\n" "    <!-- (ref)Item -->\n" "</table>"
+    )
+
+
+@pytest.fixture
+def templates():
+    return {"Item": ruiner.Template("<tr><td><!-- (param)name --></td><td><!-- (param)price --></td></tr>")}
+
+
+def converted(parameters: Invoice) -> ruiner.TemplateParameters:
+    return {"customer": parameters.customer, "Item": [{"name": i.name, "price": i.price} for i in parameters.Item]}
+
+
+kinds: "dict[str, typing.Callable[[str, str], typing.Any]]" = {"dataclass": Item, "slots": Slotted, "namedtuple": Pair}
+
+
+@pytest.mark.parametrize("kind", list(kinds))
+@pytest.mark.parametrize("mode", ["converted", "direct"])
+def test_objects(
+    benchmark: fixture.BenchmarkFixture, invoice: ruiner.Template, templates: ruiner.Templates, kind: str, mode: str
+):
+    items = [kinds[kind](f"item {j}", str(j * 10)) for j in range(10000)]
+    parameters = Invoice("customer", items)
+    expected = invoice.rendered(converted(parameters), templates)
+    benchmark.extra_info["kind"] = kind
+    benchmark.extra_info["mode"] = mode
+
+    modes = {
+        "direct": lambda: invoice.rendered(parameters, templates),  # type: ignore
+        "converted": lambda: invoice.rendered(converted(parameters), templates),
+    }
+    result = benchmark(modes[mode])
+    assert result == expected
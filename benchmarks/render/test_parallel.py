@@ -0,0 +1,45 @@
+import concurrent.futures
+import typing
+
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+
+Executor = typing.Union[
+    typing.Type[concurrent.futures.ThreadPoolExecutor], typing.Type[concurrent.futures.ProcessPoolExecutor], None
+]
+
+
+@pytest.fixture
+def table():
+    return ruiner.Template("<table>\n" "    <!-- (ref)Row -->\n" "</table>")
+
+
+@pytest.fixture
+def templates():
+    return {"Row": ruiner.Template("<tr>\n" "    <td><!-- (param)cell --></td>\n" "</tr>")}
+
+
+@pytest.fixture
+def parameters() -> ruiner.TemplateParameters:
+    return {"Row": [{"cell": [str(x + y * 10) for x in range(10)]} for y in range(100000)]}
+
+
+@pytest.mark.parametrize(
+    "executor", [None, concurrent.futures.ThreadPoolExecutor, concurrent.futures.ProcessPoolExecutor]
+)
+def test_parallel(
+    benchmark: fixture.BenchmarkFixture,
+    table: ruiner.Template,
+    templates: ruiner.Templates,
+    parameters: ruiner.TemplateParameters,
+    executor: "Executor",
+):
+    if executor is None:
+        benchmark(table.rendered, parameters, templates)
+        return
+    with executor(4) as e:
+        parallel = ruiner.Parallel(e, chunksize=4096)
+        result = benchmark(table.rendered, parameters, templates, parallel=parallel)
+    assert result == table.rendered(parameters, templates)
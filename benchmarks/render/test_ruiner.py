@@ -56,3 +56,47 @@ def test_drunk_snail(
     assert len(first) == 220806
     benchmark(test)
     assert first == test()
+
+
+def test_compiled(
+    benchmark: fixture.BenchmarkFixture,
+    table: ruiner.Template,
+    parameters: ruiner.TemplateParameters,
+    templates: typing.Dict[str, ruiner.Template],
+):
+    compiled = table.compiled(templates)
+
+    def test():
+        return compiled.rendered(parameters)
+
+    first = test()
+    assert first == table.rendered(parameters, templates)
+    benchmark(test)
+
+
+def test_stream(
+    benchmark: fixture.BenchmarkFixture,
+    table: ruiner.Template,
+    parameters: ruiner.TemplateParameters,
+    templates: typing.Dict[str, ruiner.Template],
+):
+    def test():
+        return "".join(table.stream(parameters, templates))
+
+    assert test() == table.rendered(parameters, templates)
+    benchmark(test)
+
+
+def test_linked(
+    benchmark: fixture.BenchmarkFixture,
+    table: ruiner.Template,
+    parameters: ruiner.TemplateParameters,
+    templates: typing.Dict[str, ruiner.Template],
+):
+    linked = ruiner.TemplateSet(templates)
+
+    def test():
+        return linked.rendered(table, parameters)
+
+    assert test() == table.rendered(parameters, templates)
+    benchmark(test)
@@ -0,0 +1,33 @@
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+
+
+@pytest.fixture
+def table():
+    return ruiner.Template("<table>\n    <!-- (ref)Row -->\n</table>")
+
+
+@pytest.fixture
+def templates() -> ruiner.Templates:
+    return {"Row": ruiner.Template("<tr>\n    <td><!-- (param)cell --></td>\n</tr>")}
+
+
+@pytest.fixture
+def parameters() -> ruiner.TemplateParameters:
+    return {"Row": [{"cell": [str(i) for i in range(10)]} for _ in range(10000)]}
+
+
+@pytest.mark.parametrize("mode", ["validated", "rendered"])
+def test_signature(
+    benchmark: fixture.BenchmarkFixture,
+    table: ruiner.Template,
+    templates: ruiner.Templates,
+    parameters: ruiner.TemplateParameters,
+    mode: str,
+):
+    validator = table.signature(templates).validator()
+    functions = {"validated": lambda: validator(parameters), "rendered": lambda: table.rendered(parameters, templates)}
+    benchmark.extra_info["mode"] = mode
+    benchmark(functions[mode])
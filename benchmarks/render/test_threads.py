@@ -0,0 +1,38 @@
+import concurrent.futures
+import sys
+
+import pytest
+from pytest_benchmark import fixture
+
+import ruiner
+
+
+@pytest.fixture
+def table():
+    return ruiner.Template("<table>\n    <!-- (ref)Row -->\n</table>")
+
+
+@pytest.fixture
+def templates() -> ruiner.Templates:
+    return {"Row": ruiner.Template("<tr>\n    <td><!-- (param)cell --></td>\n</tr>")}
+
+
+@pytest.fixture
+def parameters() -> ruiner.TemplateParameters:
+    return {"Row": [{"cell": [str(i) for i in range(10)]} for _ in range(1000)]}
+
+
+@pytest.mark.parametrize("threads", [1, 4, 16])
+def test_threads(
+    benchmark: fixture.BenchmarkFixture,
+    table: ruiner.Template,
+    templates: ruiner.Templates,
+    parameters: ruiner.TemplateParameters,
+    threads: int,
+):
+    renders = 64
+    benchmark.extra_info["threads"] = threads
+    benchmark.extra_info["gil"] = getattr(sys, "_is_gil_enabled", lambda: True)()
+    with concurrent.futures.ThreadPoolExecutor(threads) as executor:
+        result = benchmark(lambda: list(executor.map(lambda _: table.rendered(parameters, templates), range(renders))))
+    assert result == [table.rendered(parameters, templates)] * renders
@@ -0,0 +1,77 @@
+import collections.abc
+import dataclasses
+import typing
+
+
+class Access:
+    __slots__ = ("target", "get")
+
+    __hash__ = None  # type: ignore
+
+    def __init__(self, target: typing.Any, get: typing.Callable[[typing.Any, str], typing.Any]):
+        self.target = target
+        self.get = get
+
+    def __getitem__(self, name: str):
+        return self.get(self.target, name)
+
+    def __contains__(self, name: str):
+        try:
+            self.get(self.target, name)
+        except KeyError:
+            return False
+        return True
+
+
+missing = object()
+
+
+def fielded(names: "frozenset[str]"):
+    def get(target: typing.Any, name: str):
+        value = getattr(target, name, missing) if name in names else missing
+        if value is missing:
+            raise KeyError(name)
+        return value
+
+    return get
+
+
+def instance(target: typing.Any, name: str):
+    return vars(target)[name]
+
+
+def slots(kind: type) -> "typing.Iterable[str]":
+    value = kind.__dict__.get("__slots__", ())
+    return (value,) if isinstance(value, str) else value
+
+
+def declared(kind: type):
+    return [n for k in kind.__mro__ for n in slots(k) if not n.startswith("__")]
+
+
+def names(kind: type) -> "typing.Iterable[str]":
+    if dataclasses.is_dataclass(kind):
+        return [f.name for f in dataclasses.fields(kind)]
+    if issubclass(kind, tuple):
+        return getattr(kind, "_fields", ())
+    return declared(kind)
+
+
+accessors: "dict[type, typing.Callable[[typing.Any, str], typing.Any] | None]" = {}
+
+
+def resolved(kind: type):
+    if issubclass(kind, (collections.abc.Mapping, Access)):
+        return None
+    fields = frozenset(names(kind))
+    return fielded(fields) if fields else instance
+
+
+def viewed(parameters: typing.Any) -> typing.Any:
+    if isinstance(parameters, dict):
+        return parameters
+    kind = type(parameters)
+    if kind not in accessors:
+        accessors[kind] = resolved(kind)
+    get = accessors[kind]
+    return parameters if get is None else Access(parameters, get)
@@ -0,0 +1,41 @@
+import collections
+import concurrent.futures
+import dataclasses
+import functools
+import itertools
+import typing
+
+from .Compiled import Compiled
+
+if typing.TYPE_CHECKING:
+    from .Template import TemplateParameters
+
+
+def _rendered(compiled: Compiled, chunk: "list[TemplateParameters]"):
+    return [compiled.rendered(p) for p in chunk]
+
+
+@dataclasses.dataclass(frozen=True)
+class Batch:
+    compiled: Compiled
+    chunksize: int = 256
+
+    def chunks(self, parameters: "typing.Iterable[TemplateParameters]") -> "typing.Iterator[list[TemplateParameters]]":
+        iterator = iter(parameters)
+        chunk = list(itertools.islice(iterator, self.chunksize))
+        while chunk:
+            yield chunk
+            chunk = list(itertools.islice(iterator, self.chunksize))
+
+    def rendered(self, parameters: "typing.Iterable[TemplateParameters]") -> "typing.Iterator[str]":
+        return itertools.chain.from_iterable(map(functools.partial(_rendered, self.compiled), self.chunks(parameters)))
+
+    def parallel(self, parameters: "typing.Iterable[TemplateParameters]", workers: int) -> "typing.Iterator[str]":
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            pending: "collections.deque[concurrent.futures.Future[list[str]]]" = collections.deque()
+            for chunk in self.chunks(parameters):
+                pending.append(executor.submit(_rendered, self.compiled, chunk))
+                if len(pending) > 2 * workers:
+                    yield from pending.popleft().result()
+            for future in pending:
+                yield from future.result()
@@ -0,0 +1,77 @@
+import collections
+import dataclasses
+import itertools
+import typing
+
+from .Node import Empty, Failed, Line, Parameter, Reference, Row, Slot, Text, Tree, Values, Wrapped
+from .Renderer import Renderer
+
+if typing.TYPE_CHECKING:
+    from .Template import TemplateParameters
+
+
+class Context(str):
+    __slots__ = ()
+
+    def __add__(self, other: str):
+        return Context(str(self) + other)
+
+    def __radd__(self, other: str):
+        return Context(other + str(self))
+
+
+@dataclasses.dataclass(frozen=True)
+class Binder:
+    parameters: "TemplateParameters"
+    renderer: Renderer
+
+    def bound(self, slot: Slot):
+        return isinstance(slot, (Parameter, Reference)) and slot.name in self.parameters
+
+    def tree(self, tree: Tree):
+        return Tree(tuple(itertools.chain.from_iterable(map(self.line, tree.lines))))
+
+    def line(self, line: Line) -> "typing.Sequence[Line]":
+        if isinstance(line, Wrapped) and self.bound(line.reference):
+            return self.folded(line)
+        if not isinstance(line, Row):
+            return (line,)
+        if all(map(self.bound, line.slots)):
+            return self.folded(line)
+        return (Row(line.literals, tuple(map(self.slot, line.slots))),)
+
+    def slot(self, slot: Slot) -> Slot:
+        if not self.bound(slot):
+            return slot
+        try:
+            values = slot.rendered if isinstance(slot, Reference) else slot.values
+            return Values(tuple(values(self.parameters, self.renderer)))
+        except Exception as e:
+            return Failed(e)
+
+    def folded(self, line: Line):
+        out: "list[str]" = []
+        try:
+            steps = self.renderer.steps(out, Tree((line,)), self.parameters, Context(), Context())
+            collections.deque(steps, maxlen=0)
+        except Exception as e:
+            return self.failed(self.lines(out), e)
+        return self.lines(out)
+
+    def lines(self, out: "list[str]"):
+        result: "list[Line]" = [Empty()]
+        start: "int | None" = None
+        for i, piece in enumerate(out):
+            if not isinstance(piece, Context):
+                if start is None:
+                    result.append(Empty())
+            elif start is None:
+                start = i
+            else:
+                result[-1], start = Text("".join(out[start : i + 1])), None
+        return result
+
+    def failed(self, lines: "list[Line]", error: Exception):
+        if isinstance(lines[-1], Empty):
+            lines.pop()
+        return lines + [Failed(error)]
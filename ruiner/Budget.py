@@ -0,0 +1,100 @@
+import dataclasses
+import math
+import threading
+import time
+import typing
+
+from .Renderer import Lines
+
+if typing.TYPE_CHECKING:
+    from .Cache import Cache
+    from .Renderer import Frame
+
+
+class BudgetExceeded(Exception):
+    def __init__(self, limit: str, value: float):
+        super().__init__(limit, value)
+        self.limit = limit
+        self.value = value
+
+    def __str__(self):
+        return f"Render exceeded {self.limit} limit of {self.value}"
+
+
+@dataclasses.dataclass
+class Usage:
+    size: int = 0
+    expansions: int = 0
+    deadline: float = math.inf
+
+
+class Spending:
+    __slots__ = ("budget", "usage")
+
+    def __init__(self, budget: "Budget", usage: Usage):
+        self.budget = budget
+        self.usage = usage
+
+    def expanded(self, stack: "list[Frame]"):
+        if len(stack) // 2 > self.budget.bounds["depth"]:
+            raise self.budget.exceeded("depth")
+        self.usage.expansions += 1
+        if self.usage.expansions > self.budget.bounds["expansions"]:
+            raise self.budget.exceeded("expansions")
+
+    def pushing(self, push: "typing.Callable[[list[str], list[Frame], Frame, Cache | None], None]"):
+        def pushed(out: "list[str]", stack: "list[Frame]", frame: "Frame", cache: "Cache | None"):
+            if isinstance(frame, Lines):
+                self.expanded(stack)
+            push(out, stack, frame, cache)
+
+        return pushed
+
+    def overdue(self):
+        return self.budget.seconds is not None and time.monotonic() > self.usage.deadline
+
+    def limited(self, out: "list[str]", steps: "typing.Iterator[Frame | None]") -> "typing.Iterator[Frame | None]":
+        usage, size = self.usage, self.budget.bounds["size"]
+        before = len(out)
+        for step in steps:
+            usage.size += sum(map(len, out[before:]))
+            if usage.size > size:
+                raise self.budget.exceeded("size")
+            if self.overdue():
+                raise self.budget.exceeded("seconds")
+            yield step
+            before = len(out)
+
+
+@dataclasses.dataclass(frozen=True)
+class Budget:
+    size: "int | None" = None
+    expansions: "int | None" = None
+    depth: "int | None" = None
+    seconds: "float | None" = None
+
+    local: threading.local = dataclasses.field(init=False, repr=False, compare=False)
+    bounds: "dict[str, float]" = dataclasses.field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "local", threading.local())
+        object.__setattr__(self, "bounds", {name: self.bound(name) for name in ("size", "expansions", "depth")})
+
+    @property
+    def usage(self) -> Usage:
+        try:
+            return self.local.usage
+        except AttributeError:
+            self.local.usage = Usage()
+            return self.local.usage
+
+    def bound(self, limit: str) -> float:
+        value = getattr(self, limit)
+        return math.inf if value is None else value
+
+    def exceeded(self, limit: str):
+        return BudgetExceeded(limit, getattr(self, limit))
+
+    def spending(self):
+        self.local.usage = Usage(deadline=time.monotonic() + self.bound("seconds"))
+        return Spending(self, self.local.usage)
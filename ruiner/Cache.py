@@ -0,0 +1,114 @@
+import collections
+import collections.abc
+import dataclasses
+import sys
+import threading
+import typing
+
+from .Renderer import asynchronous
+
+if typing.TYPE_CHECKING:
+    from .Node import Tree
+    from .Template import TemplateParameters, Templates
+
+
+class Unhashable(Exception):
+    pass
+
+
+def frozen(value: typing.Any) -> typing.Hashable:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return list, tuple(map(frozen, value))
+    if isinstance(value, dict):
+        return dict, tuple(sorted(zip(value, map(frozen, value.values()))))
+    return other(value)
+
+
+def scoped(templates: "Templates | None"):
+    return templates or None
+
+
+def other(value: typing.Any) -> typing.Hashable:
+    if callable(value) or isinstance(value, collections.abc.Iterable) or asynchronous(value):
+        raise Unhashable
+    try:
+        hash(value)
+    except TypeError as e:
+        raise Unhashable from e
+    return type(value), value
+
+
+@dataclasses.dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size: int = 0
+
+    @property
+    def ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclasses.dataclass(frozen=True)
+class Cache:
+    maxsize: int = 1024
+    maxbytes: int = 1 << 24
+
+    entries: "collections.OrderedDict[typing.Hashable, tuple[Tree, Templates | None, str]]" = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+    stats: CacheStats = dataclasses.field(init=False, repr=False, compare=False)
+    lock: "typing.ContextManager[typing.Any]" = dataclasses.field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "entries", collections.OrderedDict())
+        object.__setattr__(self, "stats", CacheStats())
+        object.__setattr__(self, "lock", threading.RLock())
+
+    def key(
+        self, tree: "Tree", templates: "Templates", parameters: "TemplateParameters", left: str, right: str
+    ) -> typing.Hashable:
+        try:
+            return id(tree), id(scoped(templates)), frozen(parameters), left, right
+        except Unhashable:
+            return None
+
+    def get(self, key: typing.Hashable, tree: "Tree", templates: "Templates | None"):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] is not tree or entry[1] is not scoped(templates):
+                self.stats.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[2]
+
+    def put(self, key: typing.Hashable, tree: "Tree", templates: "Templates | None", value: str):
+        size = sys.getsizeof(value)
+        if size > self.maxbytes:
+            return
+        with self.lock:
+            self.discard(key)
+            self.entries[key] = (tree, scoped(templates), value)
+            self.stats.entries += 1
+            self.stats.size += size
+            while self.stats.entries > self.maxsize or self.stats.size > self.maxbytes:
+                self.discard(next(iter(self.entries)))
+                self.stats.evictions += 1
+
+    def discard(self, key: typing.Hashable):
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.stats.entries -= 1
+                self.stats.size -= sys.getsizeof(entry[2])
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.stats.entries = self.stats.size = 0
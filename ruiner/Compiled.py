@@ -0,0 +1,86 @@
+import dataclasses
+import typing
+
+from .Access import viewed
+from .Node import expanded, listed
+
+if typing.TYPE_CHECKING:
+    from .Template import TemplateParameters
+
+
+def _parameter(parameters: typing.Any, name: str, *, optional: bool):
+    try:
+        p = parameters[name]
+    except KeyError:
+        return [] if optional else [""]
+    return listed(p)
+
+
+def _item(target: typing.Callable[..., str], parameters: typing.Any, left: str, right: str):
+    if isinstance(parameters, str):
+        raise TypeError
+    return target(viewed(parameters), left, right)
+
+
+def _reference(
+    parameters: typing.Any,
+    name: str,
+    target: typing.Union[typing.Callable[..., str], None],
+    left: str,
+    right: str,
+    *,
+    optional: bool,
+):
+    if name not in parameters:
+        if optional:
+            return [""]
+    elif target is None:
+        raise KeyError(name)
+    return _expanded(parameters[name] if name in parameters else {}, name, target, left, right)
+
+
+def _expanded(
+    inner: typing.Any, name: str, target: typing.Union[typing.Callable[..., str], None], left: str, right: str
+):
+    if target is None:
+        raise KeyError(name)
+    return [_item(target, p, left, right) for p in expanded(inner)]
+
+
+def _invalid(message: str):
+    raise ValueError(message)
+
+
+def _failed(error: Exception):
+    raise type(error)(*error.args)
+
+
+@dataclasses.dataclass(frozen=True)
+class Compiled:
+    source: str
+    function: typing.Callable[..., str] = dataclasses.field(repr=False, compare=False)
+    constants: "tuple[typing.Any, ...]" = dataclasses.field(default=(), repr=False)
+
+    entry = "_0"
+
+    @classmethod
+    def of(cls, functions: "list[str]", constants: "typing.Sequence[typing.Any]" = ()):
+        return cls.executed("\n\n".join(functions) + "\n", tuple(constants))
+
+    @classmethod
+    def executed(cls, source: str, constants: "tuple[typing.Any, ...]" = ()):
+        namespace: "dict[str, typing.Any]" = {
+            "_parameter": _parameter,
+            "_reference": _reference,
+            "_invalid": _invalid,
+            "_failed": _failed,
+            "_constants": constants,
+        }
+        exec(compile(source, "<ruiner>", "exec"), namespace)
+        return cls(source, namespace[cls.entry], constants)
+
+    def __reduce__(self):
+        return Compiled.executed, (self.source, self.constants)
+
+    def rendered(self, parameters: "TemplateParameters", left: str = "", right: str = "") -> str:
+        return self.function(viewed(parameters), left, right)
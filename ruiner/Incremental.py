@@ -0,0 +1,148 @@
+import dataclasses
+import typing
+
+from .Access import Access
+from .Cache import Cache, Unhashable, frozen, scoped
+
+if typing.TYPE_CHECKING:
+    from .Node import Tree
+    from .Template import Template, TemplateParameters, Templates
+
+
+class Identity:
+    __slots__ = ("tree", "templates", "parameters", "left", "right", "hash", "shape")
+
+    def __init__(self, tree: "Tree", templates: "Templates | None", parameters: typing.Any, left: str, right: str):
+        self.tree = tree
+        self.templates = templates
+        self.parameters = parameters
+        self.left = left
+        self.right = right
+        self.hash = hash((id(tree), id(templates), id(parameters), left, right))
+        self.shape: "typing.Hashable" = None
+
+    def __hash__(self):
+        return self.hash
+
+    def __eq__(self, other: object):
+        return (
+            isinstance(other, Identity)
+            and self.tree is other.tree
+            and self.templates is other.templates
+            and self.parameters is other.parameters
+            and (self.left, self.right) == (other.left, other.right)
+        )
+
+    def shaped(self):
+        if self.shape is None:
+            try:
+                self.shape = (id(self.tree), id(self.templates), frozen(self.parameters), self.left, self.right)
+            except Unhashable:
+                self.shape = False
+        return self.shape
+
+
+def pruned(mapping: "dict[typing.Any, typing.Any]", alive: "typing.Callable[[typing.Any, typing.Any], bool]"):
+    for key in [k for k, v in mapping.items() if not alive(k, v)]:
+        del mapping[key]
+
+
+@dataclasses.dataclass(frozen=True)
+class Retained(Cache):
+    maxsize: int = 1 << 16
+    maxbytes: int = 1 << 28
+
+    children: "dict[Identity, list[Identity]]" = dataclasses.field(init=False, repr=False, compare=False)
+    shapes: "dict[typing.Hashable, Identity]" = dataclasses.field(init=False, repr=False, compare=False)
+    used: "set[Identity]" = dataclasses.field(init=False, repr=False, compare=False)
+    rendering: "list[Identity]" = dataclasses.field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        super().__post_init__()
+        object.__setattr__(self, "children", {})
+        object.__setattr__(self, "shapes", {})
+        object.__setattr__(self, "used", set())
+        object.__setattr__(self, "rendering", [])
+
+    def key(self, tree: "Tree", templates: "Templates", parameters: "TemplateParameters", left: str, right: str):
+        target = parameters.target if isinstance(parameters, Access) else parameters
+        return Identity(tree, scoped(templates), target, left, right)
+
+    def similar(self, key: Identity):
+        shape = key.shaped()
+        old = self.shapes.get(shape) if shape else None
+        if old is None or old not in self.entries:
+            return None
+        super().put(key, key.tree, key.templates, self.entries[old][2])
+        self.children[key] = self.children.get(old, [])
+        return self.entries[key]
+
+    def get(self, key: typing.Hashable, tree: "Tree", templates: "Templates | None"):
+        key = typing.cast(Identity, key)
+        entry = self.entries.get(key) or self.similar(key)
+        if entry is None:
+            self.stats.misses += 1
+            self.children[key] = []
+            self.rendering.append(key)
+            return None
+        self.stats.hits += 1
+        self.link(key)
+        self.keep(key)
+        return entry[2]
+
+    def put(self, key: typing.Hashable, tree: "Tree", templates: "Templates | None", value: str):
+        key = typing.cast(Identity, key)
+        self.rendering.pop()
+        if not key.shaped():
+            return
+        super().put(key, tree, templates, value)
+        self.link(key)
+        self.used.add(key)
+        self.shapes[key.shape] = key
+
+    def link(self, key: Identity):
+        if self.rendering:
+            self.children[self.rendering[-1]].append(key)
+
+    def keep(self, key: Identity):
+        pending = [key]
+        while pending:
+            current = pending.pop()
+            self.used.add(current)
+            pending += self.children.get(current, ())
+
+    def begin(self):
+        self.used.clear()
+        self.rendering.clear()
+
+    def sweep(self):
+        for key in [k for k in self.entries if k not in self.used]:
+            self.discard(key)
+        pruned(self.children, lambda key, _: key in self.entries)
+        pruned(self.shapes, lambda _, key: key in self.entries)
+
+    def clear(self):
+        super().clear()
+        self.children.clear()
+        self.shapes.clear()
+        self.begin()
+
+
+@dataclasses.dataclass(frozen=True)
+class Incremental:
+    template: "Template"
+    templates: "Templates" = dataclasses.field(default_factory=dict)
+    left: str = ""
+    right: str = ""
+
+    retained: Retained = dataclasses.field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "retained", Retained())
+
+    def rendered(self, parameters: "TemplateParameters"):
+        with self.retained.lock:
+            self.retained.begin()
+            result = self.template.rendered(parameters, self.templates, self.left, self.right, cache=self.retained)
+            self.retained.sweep()
+            return result
@@ -0,0 +1,425 @@
+import collections.abc
+import dataclasses
+import typing
+
+from .Renderer import AsyncCells, AsyncExpansion, AsyncRows, Cells, Expansion, Renderer, Rows, asynchronous
+
+if typing.TYPE_CHECKING:
+    from .Budget import Budget
+    from .Cache import Cache
+    from .Parallel import Parallel
+    from .Profile import Profile
+    from .Template import TemplateParameters, Templates
+
+
+class Node:
+    __slots__ = ()
+
+    def __reduce__(self):
+        return self.__class__, tuple(getattr(self, f.name) for f in dataclasses.fields(typing.cast(typing.Any, self)))
+
+    def linked(self, targets: "dict[str, Target]") -> typing.Any:
+        return self
+
+
+def lazy(value: typing.Any):
+    return isinstance(value, collections.abc.Iterable) and not isinstance(value, (str, collections.abc.Mapping))
+
+
+def listed(p: typing.Any) -> "typing.Iterable[str]":
+    if isinstance(p, list):
+        return p  # type: ignore
+    if isinstance(p, str):
+        return [p]
+    if callable(p):
+        return listed(p())
+    if deferred(p):
+        return p
+    raise TypeError
+
+
+def deferred(value: typing.Any):
+    return lazy(value) or asynchronous(value)
+
+
+def iterated(inner: typing.Any) -> "typing.Iterable[typing.Any]":
+    return inner if (lazy(inner) and not hasattr(inner, "_fields")) or asynchronous(inner) else (inner,)
+
+
+def expanded(inner: typing.Any) -> "typing.Iterable[typing.Any]":
+    if isinstance(inner, dict):
+        return (inner,)
+    if isinstance(inner, list):
+        return inner
+    if isinstance(inner, str):
+        raise TypeError
+    return expanded(inner()) if callable(inner) else iterated(inner)
+
+
+async def sourced(
+    value: typing.Any, resolved: "typing.Callable[[typing.Any], typing.Iterable[typing.Any]]"
+) -> "typing.AsyncIterator[typing.Any]":
+    if isinstance(value, collections.abc.Awaitable):
+        value = await value
+    if isinstance(value, collections.abc.AsyncIterable):
+        async for item in value:
+            yield item
+    else:
+        for item in resolved(value):
+            yield item
+
+
+async def achecked(inner: typing.Any) -> "typing.AsyncIterator[TemplateParameters]":
+    async for p in sourced(inner, expanded):
+        if isinstance(p, str):
+            raise TypeError
+        yield p
+
+
+async def zipped(sources: "list[typing.AsyncIterator[typing.Any]]") -> "typing.AsyncIterator[tuple[typing.Any, ...]]":
+    while True:
+        try:
+            row = tuple([await s.__anext__() for s in sources])
+        except StopAsyncIteration:
+            return
+        yield row
+
+
+@dataclasses.dataclass(frozen=True)
+class Parameter(Node):
+    __slots__ = ("name", "optional")
+
+    name: str
+    optional: bool
+
+    def values(self, parameters: "TemplateParameters", _: Renderer) -> "typing.Iterable[str]":
+        try:
+            p = parameters[self.name]
+        except KeyError:
+            return [] if self.optional else [""]
+        return listed(p)
+
+    def source(self, *_: typing.Any):
+        return f"_parameter(parameters, {self.name!r}, optional={self.optional})"
+
+
+@dataclasses.dataclass(frozen=True)
+class Reference(Node):
+    __slots__ = ("name", "optional")
+
+    name: str
+    optional: bool
+
+    def inner(self, parameters: "TemplateParameters", templates: "Templates"):
+        if self.name not in parameters:
+            if self.optional:
+                return None
+        elif self.name not in templates:
+            raise KeyError(self.name)
+        return parameters[self.name] if self.name in parameters else {}
+
+    def tree(self, templates: "Templates") -> "Tree":
+        return templates[self.name].tree
+
+    def expansions(
+        self, parameters: "TemplateParameters", templates: "Templates"
+    ) -> "tuple[Tree, typing.Iterable[typing.Any]] | None":
+        inner = self.inner(parameters, templates)
+        if inner is None:
+            return None
+        tree = self.tree(templates)
+        return tree, expanded(inner)
+
+    def values(self, parameters: "TemplateParameters", renderer: Renderer) -> "list[str] | Column":
+        expansions = self.expansions(parameters, renderer.templates)
+        if expansions is None:
+            return [""]
+        tree, inners = expansions
+        if asynchronous(inners):
+            return Column((tree, self.name), inners)
+        items = list(checked(inners)) if isinstance(inners, (list, tuple)) else checked(inners)
+        return Column((tree, self.name), items)
+
+    def rendered(self, parameters: "TemplateParameters", renderer: Renderer) -> "list[str]":
+        column = self.values(parameters, renderer)
+        if isinstance(column, list):
+            return column
+        return [renderer.rendered(column.target[0], p, name=self.name) for p in column.inners]
+
+    def source(self, names: "dict[str, str]", _: "list[typing.Any]", left: str = '""', right: str = '""'):
+        target = names.get(self.name, "None")
+        return f"_reference(parameters, {self.name!r}, {target}, {left}, {right}, optional={self.optional})"
+
+    def linked(self, targets: "dict[str, Target]"):
+        return Link(self.name, self.optional, targets[self.name])
+
+
+class Column:
+    __slots__ = ("target", "inners")
+
+    def __init__(self, target: "tuple[Tree, str]", inners: typing.Any):
+        self.target = target
+        self.inners = inners
+
+
+class Target:
+    __slots__ = ("tree", "cycle")
+
+    tree: "Tree"
+    cycle: "tuple[str, ...]"
+
+
+@dataclasses.dataclass(frozen=True)
+class Link(Reference):
+    __slots__ = ("target",)
+
+    target: Target
+
+    def inner(self, parameters: "TemplateParameters", templates: "Templates"):
+        if self.name in parameters:
+            return parameters[self.name]
+        return None if self.optional else {}
+
+    def tree(self, templates: "Templates"):
+        return self.target.tree
+
+    def expansions(
+        self, parameters: "TemplateParameters", templates: "Templates"
+    ) -> "tuple[Tree, typing.Iterable[typing.Any]] | None":
+        if self.name in parameters or self.optional or not self.target.cycle:
+            return super().expansions(parameters, templates)
+        cycle = " -> ".join(self.target.cycle)
+        return Tree((Failed(RecursionError(f"Templates reference each other without parameters: {cycle}")),)), [{}]
+
+
+def checked(inner: "typing.Iterable[typing.Any]") -> "typing.Iterator[TemplateParameters]":
+    for p in inner:
+        if isinstance(p, str):
+            raise TypeError
+        yield p
+
+
+@dataclasses.dataclass(frozen=True)
+class Invalid(Node):
+    __slots__ = ("message",)
+
+    message: str
+
+    def values(self, *_: typing.Any) -> "list[str]":
+        raise ValueError(self.message)
+
+    def source(self, *_: typing.Any):
+        return f"_invalid({self.message!r})"
+
+
+@dataclasses.dataclass(frozen=True)
+class Values(Node):
+    __slots__ = ("items",)
+
+    items: "tuple[typing.Any, ...]"
+
+    def values(self, *_: typing.Any):
+        return self.items
+
+    def source(self, _: "dict[str, str]", constants: "list[typing.Any]"):
+        constants.append(self.items)
+        return f"_constants[{len(constants) - 1}]"
+
+
+@dataclasses.dataclass(frozen=True)
+class Failed(Node):
+    __slots__ = ("error",)
+
+    error: Exception
+
+    @property
+    def raised(self):
+        return type(self.error)(*self.error.args)
+
+    def values(self, *_: typing.Any) -> "list[str]":
+        raise self.raised
+
+    def step(self, *_: typing.Any):
+        raise self.raised
+
+    def source(self, _: "dict[str, str]", constants: "list[typing.Any]"):
+        constants.append(self.error)
+        return f"_failed(_constants[{len(constants) - 1}])"
+
+
+Slot = typing.Union[Parameter, Reference, Invalid, Values, Failed]
+
+
+@dataclasses.dataclass(frozen=True)
+class Text(Node):
+    __slots__ = ("value",)
+
+    value: str
+
+    def step(self, out: "list[str]", _: "TemplateParameters", __: Renderer, left: str, right: str):
+        out += (left, self.value, right)
+
+    def source(self, *_: typing.Any):
+        return f"left + {self.value!r} + right"
+
+
+def sequences(columns: "list[typing.Iterable[typing.Any]]"):
+    return all(isinstance(c, (list, tuple)) for c in columns)
+
+
+def targeted(column: typing.Any) -> "tuple[Tree, str] | None":
+    return column.target if isinstance(column, Column) else None
+
+
+def unwrapped(column: typing.Any) -> typing.Any:
+    return column.inners if isinstance(column, Column) else column
+
+
+def source(target: "tuple[Tree, str] | None", column: typing.Any) -> "typing.AsyncIterator[typing.Any]":
+    return sourced(column, listed) if target is None else achecked(column)
+
+
+@dataclasses.dataclass(frozen=True)
+class Row(Node):
+    __slots__ = ("literals", "slots")
+
+    literals: "tuple[str, ...]"
+    slots: "tuple[Slot, ...]"
+
+    def step(self, out: "list[str]", parameters: "TemplateParameters", renderer: Renderer, left: str, right: str):
+        columns: "list[typing.Any]" = [s.values(parameters, renderer) for s in self.slots]
+        if not sequences(columns):
+            return self.pulled(columns, left, right)
+        rows = Rows(self.literals, zip(*columns), left, right)
+        return rows if rows.emit(out, rows.batch) else None
+
+    def pulled(self, columns: "list[typing.Any]", left: str, right: str) -> "Rows | Cells":
+        if any(isinstance(c, Column) for c in columns):
+            return self.cells(columns, left, right)
+        if any(map(asynchronous, columns)):
+            return AsyncRows(self.literals, zipped([sourced(c, listed) for c in columns]), left, right)
+        return Rows(self.literals, zip(*columns), left, right)
+
+    def cells(self, columns: "list[typing.Any]", left: str, right: str):
+        targets = tuple(map(targeted, columns))
+        values = list(map(unwrapped, columns))
+        if any(map(asynchronous, values)):
+            return AsyncCells(self.literals, targets, zipped(list(map(source, targets, values))), left, right)
+        return Cells(self.literals, targets, zip(*values), left, right)
+
+    def linked(self, targets: "dict[str, Target]"):
+        return Row(self.literals, tuple(s.linked(targets) for s in self.slots))
+
+    def _row(self, variables: "list[str]"):
+        result = ["left", repr(self.literals[0])]
+        for variable, literal in zip(variables, self.literals[1:]):
+            result += (variable, repr(literal))
+        return " + ".join([r for r in result if r != "''"] + ["right"])
+
+    def source(self, names: "dict[str, str]", constants: "list[typing.Any]"):
+        variables = [f"v{i}" for i in range(len(self.slots))]
+        inner = ", ".join(s.source(names, constants) for s in self.slots)
+        return f'"\\n".join([{self._row(variables)} for {", ".join(variables)}, in zip({inner})])'
+
+
+def parallelized(renderer: Renderer) -> "Parallel | None":
+    return renderer.parallel if renderer.budget is None else None
+
+
+@dataclasses.dataclass(frozen=True)
+class Wrapped(Node):
+    __slots__ = ("left", "reference", "right")
+
+    left: str
+    reference: Reference
+    right: str
+
+    def step(self, out: "list[str]", parameters: "TemplateParameters", renderer: Renderer, left: str, right: str):
+        expansions = self.reference.expansions(parameters, renderer.templates)
+        if expansions is None:
+            return None
+        tree, inners = expansions
+        left, right = left + self.left, self.right + right
+        parallel = parallelized(renderer)
+        if parallel is not None and isinstance(inners, (list, tuple)) and len(inners) >= parallel.threshold:
+            out.append(parallel.rendered(tree, inners, renderer.templates, left, right))
+            return None
+        return self.expansion(tree, inners, left, right)
+
+    def expansion(self, tree: "Tree", inners: "typing.Iterable[typing.Any]", left: str, right: str) -> "Expansion":
+        if not isinstance(inners, (list, tuple)) and asynchronous(inners):
+            return AsyncExpansion(tree, achecked(inners), left, right, self.reference.name)
+        return Expansion(tree, checked(inners), left, right, self.reference.name)
+
+    def linked(self, targets: "dict[str, Target]"):
+        return Wrapped(self.left, self.reference.linked(targets), self.right)
+
+    def source(self, names: "dict[str, str]", constants: "list[typing.Any]"):
+        left = f"left + {self.left!r}" if self.left else "left"
+        right = f"{self.right!r} + right" if self.right else "right"
+        return f'"\\n".join({self.reference.source(names, constants, left, right)})'
+
+
+@dataclasses.dataclass(frozen=True)
+class Empty(Node):
+    __slots__ = ()
+
+    def step(self, *_: typing.Any):
+        return None
+
+    def source(self, *_: typing.Any):
+        return '""'
+
+
+Line = typing.Union[Text, Row, Wrapped, Empty, Failed]
+
+
+def required(slots: "typing.Iterable[Slot | Line]") -> "typing.Iterator[str | bool]":
+    for s in slots:
+        if isinstance(s, (Invalid, Failed)):
+            yield False
+        elif isinstance(s, Reference) and not s.optional:
+            yield s.name
+
+
+@dataclasses.dataclass(frozen=True)
+class Tree(Node):
+    __slots__ = ("lines",)
+
+    lines: "tuple[Line, ...]"
+
+    def rendered(
+        self,
+        parameters: "TemplateParameters",
+        templates: "Templates",
+        left: str = "",
+        right: str = "",
+        parallel: "Parallel | None" = None,
+        cache: "Cache | None" = None,
+        profile: "Profile | None" = None,
+        name: str = "",
+        budget: "Budget | None" = None,
+    ):
+        return Renderer(templates, parallel, cache=cache, profile=profile, budget=budget).rendered(
+            self, parameters, left, right, name
+        )
+
+    def required(self) -> "typing.Iterator[str | bool]":
+        for line in self.lines:
+            if isinstance(line, Wrapped):
+                yield from required((line.reference,))
+            elif isinstance(line, Row):
+                yield from required(line.slots)
+            else:
+                yield from required((line,))
+        yield True
+
+    def linked(self, targets: "dict[str, Target]"):
+        return Tree(tuple(line.linked(targets) for line in self.lines))
+
+    def source(self, identifier: str, names: "dict[str, str]", constants: "list[typing.Any]"):
+        lines = [line.source(names, constants) for line in self.lines]
+        if len(lines) == 1:
+            return f"def {identifier}(parameters, left, right):\n    return {lines[0]}"
+        body = "".join(f"        {line},\n" for line in lines)
+        return f'def {identifier}(parameters, left, right):\n    return "\\n".join((\n{body}    ))'
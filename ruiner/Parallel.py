@@ -0,0 +1,31 @@
+import concurrent.futures
+import dataclasses
+import itertools
+import typing
+
+from .Node import Tree, checked
+
+if typing.TYPE_CHECKING:
+    from .Template import TemplateParameters, Templates
+
+
+def _rendered(
+    tree: Tree, chunk: "typing.Sequence[TemplateParameters]", templates: "Templates", left: str, right: str
+) -> "list[str]":
+    return [tree.rendered(p, templates, left, right) for p in checked(chunk)]
+
+
+@dataclasses.dataclass(frozen=True)
+class Parallel:
+    executor: concurrent.futures.Executor
+    threshold: int = 1024
+    chunksize: int = 256
+
+    def rendered(
+        self, tree: Tree, inners: "typing.Sequence[typing.Any]", templates: "Templates", left: str, right: str
+    ):
+        futures = [
+            self.executor.submit(_rendered, tree, inners[i : i + self.chunksize], templates, left, right)
+            for i in range(0, len(inners), self.chunksize)
+        ]
+        return "\n".join(itertools.chain.from_iterable(f.result() for f in futures))
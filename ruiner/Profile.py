@@ -0,0 +1,109 @@
+import dataclasses
+import threading
+import time
+import typing
+
+from .Renderer import Lines
+
+if typing.TYPE_CHECKING:
+    from .Cache import Cache
+    from .Renderer import Frame
+
+
+@dataclasses.dataclass
+class TemplateStats:
+    calls: int = 0
+    total: int = 0
+    own: int = 0
+    size: int = 0
+
+    def add(self, other: "TemplateStats"):
+        self.calls += other.calls
+        self.total += other.total
+        self.own += other.own
+        self.size += other.size
+
+
+@dataclasses.dataclass
+class Record:
+    name: str
+    start: int
+    children: int = 0
+    size: int = 0
+
+
+class Recording:
+    __slots__ = ("profile", "stack", "records")
+
+    def __init__(self, profile: "Profile", stack: "list[Frame]"):
+        self.profile = profile
+        self.stack = stack
+        self.records: "list[Record]" = []
+
+    def begin(self, name: str):
+        self.records.append(Record(name, time.perf_counter_ns()))
+
+    def end(self):
+        record = self.records.pop()
+        total = time.perf_counter_ns() - record.start
+        stats = TemplateStats(1, total, total - record.children, record.size)
+        if self.records:
+            self.records[-1].children += total
+            self.records[-1].size += record.size
+        self.profile.add(record.name, stats)
+        return record.name, stats
+
+    def pushing(self, push: "typing.Callable[[list[str], list[Frame], Frame, Cache | None], None]"):
+        def pushed(out: "list[str]", stack: "list[Frame]", frame: "Frame", cache: "Cache | None"):
+            push(out, stack, frame, cache)
+            if stack and stack[-1] is frame and isinstance(frame, Lines):
+                self.begin(frame.name)
+
+        return pushed
+
+    def finishing(self, finished: "typing.Callable[[list[str], Frame, Cache | None], None]"):
+        def done(out: "list[str]", frame: "Frame", cache: "Cache | None"):
+            finished(out, frame, cache)
+            if isinstance(frame, Lines):
+                self.profile.called(*self.end())
+
+        return done
+
+    def observed(self, out: "list[str]", steps: "typing.Iterator[Frame | None]") -> "typing.Iterator[Frame | None]":
+        before = len(out)
+        try:
+            for step in steps:
+                self.records[-1].size += sum(map(len, out[before:]))
+                yield step
+                before = len(out)
+        finally:
+            while self.stack:
+                if isinstance(self.stack.pop(), Lines):
+                    self.end()
+
+
+@dataclasses.dataclass(frozen=True)
+class Profile:
+    hook: "typing.Callable[[str, TemplateStats], None] | None" = None
+
+    templates: "dict[str, TemplateStats]" = dataclasses.field(init=False, repr=False, compare=False)
+    lock: threading.Lock = dataclasses.field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "templates", {})
+        object.__setattr__(self, "lock", threading.Lock())
+
+    def recording(self, stack: "list[Frame]"):
+        return Recording(self, stack)
+
+    def add(self, name: str, stats: TemplateStats):
+        with self.lock:
+            self.templates.setdefault(name, TemplateStats()).add(stats)
+
+    def called(self, name: str, stats: TemplateStats):
+        if self.hook is not None:
+            self.hook(name, stats)
+
+    def clear(self):
+        with self.lock:
+            self.templates.clear()
@@ -0,0 +1,413 @@
+import asyncio
+import collections
+import collections.abc
+import contextlib
+import dataclasses
+import itertools
+import typing
+
+from .Access import viewed
+
+if typing.TYPE_CHECKING:
+    from .Budget import Budget, Spending
+    from .Cache import Cache
+    from .Node import Tree
+    from .Parallel import Parallel
+    from .Profile import Profile, Recording
+    from .Template import TemplateParameters, Templates
+
+_end = object()
+
+
+def asynchronous(value: typing.Any):
+    return isinstance(value, (collections.abc.Awaitable, collections.abc.AsyncIterable))
+
+
+async def following(source: "typing.AsyncIterator[typing.Any]") -> typing.Any:
+    try:
+        return await source.__anext__()
+    except StopAsyncIteration:
+        return _end
+
+
+async def taken(source: "typing.AsyncIterator[typing.Any]", count: int) -> "list[typing.Any]":
+    result: "list[typing.Any]" = []
+    while len(result) < count:
+        item = await following(source)
+        if item is _end:
+            break
+        result.append(item)
+    return result
+
+
+class Lines:
+    __slots__ = ("tree", "lines", "index", "parameters", "left", "right", "name", "key", "start")
+
+    def __init__(self, tree: "Tree", parameters: "TemplateParameters", left: str, right: str, name: str = ""):
+        self.tree = tree
+        self.lines = tree.lines
+        self.index = 0
+        self.parameters = viewed(parameters)
+        self.left = left
+        self.right = right
+        self.name = name
+        self.key: "typing.Hashable" = None
+        self.start = 0
+
+    def advance(self, out: "list[str]", renderer: "Renderer") -> "Frame | None":
+        while self.index < len(self.lines):
+            if self.index:
+                out.append("\n")
+            self.index += 1
+            frame = self.lines[self.index - 1].step(out, self.parameters, renderer, self.left, self.right)
+            if frame is not None:
+                return frame
+        return None
+
+
+class Expansion:
+    __slots__ = ("tree", "inners", "left", "right", "reference", "first")
+
+    def __init__(
+        self, tree: "Tree", inners: "typing.Iterator[TemplateParameters]", left: str, right: str, reference: str = ""
+    ):
+        self.tree = tree
+        self.inners = inners
+        self.left = left
+        self.right = right
+        self.reference = reference
+        self.first = True
+
+    def advance(self, out: "list[str]", _: "Renderer") -> "Frame | None":
+        p = next(self.inners, _end)
+        if p is _end:
+            return None
+        if self.first:
+            self.first = False
+        else:
+            out.append("\n")
+        return Lines(self.tree, typing.cast("TemplateParameters", p), self.left, self.right, self.reference)
+
+
+class Rows:
+    __slots__ = ("parts", "rows", "left", "right", "first")
+
+    batch = 1024
+
+    def __init__(self, literals: "tuple[str, ...]", rows: "typing.Iterator[tuple[str, ...]]", left: str, right: str):
+        self.parts = [""] * (2 * len(literals) - 1)
+        self.parts[::2] = literals
+        self.rows = rows
+        self.left = left
+        self.right = right
+        self.first = True
+
+    def emit(self, out: "list[str]", count: "int | None"):
+        rows: "list[str]" = []
+        for values in itertools.islice(self.rows, count):
+            self.parts[1::2] = values
+            rows += ("\n", self.left, "".join(self.parts), self.right)
+        out += rows[1:] if self.first else rows
+        self.first = self.first and not rows
+        return count is not None and len(rows) == 4 * count
+
+    def advance(self, out: "list[str]", _: "Renderer") -> "Frame | None":
+        return self if self.emit(out, self.batch) else None
+
+
+class Cells:
+    __slots__ = ("literals", "targets", "rows", "left", "right", "first", "row", "index")
+
+    def __init__(
+        self,
+        literals: "tuple[str, ...]",
+        targets: "tuple[tuple[Tree, str] | None, ...]",
+        rows: "typing.Iterator[tuple[typing.Any, ...]]",
+        left: str,
+        right: str,
+    ):
+        self.literals = literals
+        self.targets = targets
+        self.rows = rows
+        self.left = left
+        self.right = right
+        self.first = True
+        self.row: "tuple[typing.Any, ...] | None" = None
+        self.index = 0
+
+    def started(self, out: "list[str]"):
+        self.row = next(self.rows, None)
+        if self.row is not None:
+            if not self.first:
+                out.append("\n")
+            out += (self.left, self.literals[0])
+            self.first = False
+            self.index = 0
+        return self.row
+
+    def advance(self, out: "list[str]", _: "Renderer") -> "Frame | None":
+        row = self.row
+        if row is None:
+            row = self.started(out)
+            if row is None:
+                return None
+        else:
+            out.append(self.literals[self.index])
+        while self.index < len(self.targets):
+            target, value = self.targets[self.index], row[self.index]
+            self.index += 1
+            if target is not None:
+                return Lines(target[0], value, "", "", target[1])
+            out += (value, self.literals[self.index])
+        out.append(self.right)
+        self.row = None
+        return self
+
+
+class Awaiting:
+    __slots__ = ("awaitable", "value", "done")
+
+    def __init__(self, awaitable: "typing.Coroutine[typing.Any, typing.Any, typing.Any]"):
+        self.awaitable = awaitable
+        self.value: typing.Any = None
+        self.done = False
+
+    async def resolve(self):
+        self.value = await self.awaitable
+        self.done = True
+
+    def advance(self, *_: typing.Any) -> "Frame | None":
+        if not self.done:
+            self.awaitable.close()
+            raise TypeError("Asynchronous parameters can only be rendered with arendered or astream")
+        return None
+
+
+class AsyncExpansion(Expansion):
+    __slots__ = ("source", "waiting")
+
+    def __init__(
+        self,
+        tree: "Tree",
+        source: "typing.AsyncIterator[TemplateParameters]",
+        left: str,
+        right: str,
+        reference: str = "",
+    ):
+        super().__init__(tree, iter(()), left, right, reference)
+        self.source = source
+        self.waiting: "Awaiting | None" = None
+
+    def advance(self, out: "list[str]", _: "Renderer") -> "Frame | None":
+        if self.waiting is None:
+            self.waiting = Awaiting(following(self.source))
+            return self.waiting
+        p, self.waiting = self.waiting.value, None
+        self.inners = iter(() if p is _end else (p,))
+        return super().advance(out, _)
+
+
+class AsyncRows(Rows):
+    __slots__ = ("source", "waiting")
+
+    def __init__(
+        self, literals: "tuple[str, ...]", source: "typing.AsyncIterator[tuple[str, ...]]", left: str, right: str
+    ):
+        super().__init__(literals, iter(()), left, right)
+        self.source = source
+        self.waiting: "Awaiting | None" = None
+
+    def advance(self, out: "list[str]", _: "Renderer") -> "Frame | None":
+        if self.waiting is None:
+            self.waiting = Awaiting(taken(self.source, self.batch))
+            return self.waiting
+        rows, self.waiting = self.waiting.value, None
+        self.rows = iter(rows)
+        self.emit(out, None)
+        return self if len(rows) == self.batch else None
+
+
+class AsyncCells(Cells):
+    __slots__ = ("source", "waiting")
+
+    def __init__(
+        self,
+        literals: "tuple[str, ...]",
+        targets: "tuple[tuple[Tree, str] | None, ...]",
+        source: "typing.AsyncIterator[tuple[typing.Any, ...]]",
+        left: str,
+        right: str,
+    ):
+        super().__init__(literals, targets, iter(()), left, right)
+        self.source = source
+        self.waiting: "Awaiting | None" = None
+
+    def advance(self, out: "list[str]", _: "Renderer") -> "Frame | None":
+        if self.row is None:
+            if self.waiting is None:
+                self.waiting = Awaiting(following(self.source))
+                return self.waiting
+            row, self.waiting = self.waiting.value, None
+            self.rows = iter(() if row is _end else (row,))
+        return super().advance(out, _)
+
+
+Frame = typing.Union[Lines, Expansion, Rows, Cells, Awaiting]
+
+
+@dataclasses.dataclass(frozen=True)
+class Renderer:
+    templates: "Templates"
+    parallel: "Parallel | None" = None
+    depth: int = 1000
+    cache: "Cache | None" = None
+    profile: "Profile | None" = None
+    budget: "Budget | None" = None
+
+    def steps(
+        self,
+        out: "list[str]",
+        tree: "Tree",
+        parameters: "TemplateParameters",
+        left: str,
+        right: str,
+        cache: "Cache | None" = None,
+        name: str = "",
+    ) -> "typing.Iterator[Frame | None]":
+        stack: "list[Frame]" = []
+        recording = None if self.profile is None else self.profile.recording(stack)
+        spending = None if self.budget is None else self.budget.spending()
+        push, finished = self.hooked(recording, spending)
+        steps = self.walk(out, stack, Lines(tree, parameters, left, right, name), cache, push, finished)
+        if spending is not None:
+            steps = spending.limited(out, steps)
+        return steps if recording is None else recording.observed(out, steps)
+
+    def hooked(self, recording: "Recording | None", spending: "Spending | None"):
+        push, finished = self.push, self.finished
+        if recording is not None:
+            push, finished = recording.pushing(push), recording.finishing(finished)
+        if spending is not None:
+            push = spending.pushing(push)
+        return push, finished
+
+    def walk(
+        self,
+        out: "list[str]",
+        stack: "list[Frame]",
+        frame: "Frame",
+        cache: "Cache | None",
+        push: "typing.Callable[[list[str], list[Frame], Frame, Cache | None], None]",
+        finished: "typing.Callable[[list[str], Frame, Cache | None], None]",
+    ) -> "typing.Iterator[Frame | None]":
+        push(out, stack, frame, cache)
+        while stack:
+            step = stack[-1].advance(out, self)
+            yield step
+            if step is None:
+                finished(out, stack.pop(), cache)
+            elif step is not stack[-1]:
+                push(out, stack, step, cache)
+
+    def push(self, out: "list[str]", stack: "list[Frame]", frame: "Frame", cache: "Cache | None"):
+        if len(stack) > 2 * self.depth + 1 and not isinstance(frame, Awaiting):
+            raise RecursionError(f"Templates nested deeper than {self.depth} levels")
+        if cache is None or not self.hit(out, frame, cache):
+            stack.append(frame)
+
+    def hit(self, out: "list[str]", frame: "Frame", cache: "Cache"):
+        if not isinstance(frame, Lines):
+            return False
+        frame.key = cache.key(frame.tree, self.templates, frame.parameters, frame.left, frame.right)
+        if frame.key is None:
+            return False
+        value = cache.get(frame.key, frame.tree, self.templates)
+        if value is None:
+            frame.start = len(out)
+            return False
+        out.append(value)
+        return True
+
+    def finished(self, out: "list[str]", frame: "Frame", cache: "Cache | None"):
+        if cache is not None and isinstance(frame, Lines) and frame.key is not None:
+            cache.put(frame.key, frame.tree, self.templates, "".join(out[frame.start :]))
+
+    def rendered(self, tree: "Tree", parameters: "TemplateParameters", left: str = "", right: str = "", name: str = ""):
+        out: "list[str]" = []
+        collections.deque(self.steps(out, tree, parameters, left, right, self.cache, name), maxlen=0)
+        return "".join(out)
+
+    def stream(
+        self,
+        tree: "Tree",
+        parameters: "TemplateParameters",
+        left: str = "",
+        right: str = "",
+        pieces: int = 1,
+        name: str = "",
+    ) -> "typing.Iterator[str]":
+        out: "list[str]" = []
+        for _ in self.steps(out, tree, parameters, left, right, name=name):
+            if len(out) >= pieces:
+                chunk = "".join(out)
+                out.clear()
+                if chunk:
+                    yield chunk
+        if out:
+            yield "".join(out)
+
+    async def asteps(
+        self,
+        out: "list[str]",
+        tree: "Tree",
+        parameters: "TemplateParameters",
+        left: str,
+        right: str,
+        cache: "Cache | None" = None,
+        name: str = "",
+        interval: int = 256,
+    ) -> "typing.AsyncIterator[None]":
+        steps = typing.cast(
+            "typing.Generator[Frame | None, None, None]", self.steps(out, tree, parameters, left, right, cache, name)
+        )
+        with contextlib.closing(steps):
+            for i, step in enumerate(steps, start=1):
+                if isinstance(step, Awaiting):
+                    await step.resolve()
+                elif not i % interval:
+                    await asyncio.sleep(0)
+                yield
+
+    async def arendered(
+        self,
+        tree: "Tree",
+        parameters: "TemplateParameters",
+        left: str = "",
+        right: str = "",
+        name: str = "",
+        interval: int = 256,
+    ):
+        out: "list[str]" = []
+        async for _ in self.asteps(out, tree, parameters, left, right, self.cache, name, interval):
+            pass
+        return "".join(out)
+
+    async def astream(
+        self,
+        tree: "Tree",
+        parameters: "TemplateParameters",
+        left: str = "",
+        right: str = "",
+        pieces: int = 1,
+        name: str = "",
+        interval: int = 256,
+    ) -> "typing.AsyncIterator[str]":
+        out: "list[str]" = []
+        async for _ in self.asteps(out, tree, parameters, left, right, name=name, interval=interval):
+            if len(out) >= pieces:
+                chunk = "".join(out)
+                out.clear()
+                if chunk:
+                    yield chunk
+        if out:
+            yield "".join(out)
@@ -0,0 +1,116 @@
+import dataclasses
+import re
+import typing
+
+from .Node import Invalid, Line, Parameter, Reference, Row, Slot, Text, Tree, Wrapped
+
+
+@dataclasses.dataclass(frozen=True)
+class Token:
+    start: int
+    stop: int
+    kind: str
+    name: str
+    optional: bool
+
+
+@dataclasses.dataclass(frozen=True)
+class Scanner:
+    source: str
+
+    opening = "<!--"
+    close = "-->"
+    optional = "(optional)"
+    delimiter = "\n"
+    word = re.compile(r"\w*")
+
+    def _word(self, start: int):
+        return self.word.match(self.source, start).end()  # type: ignore
+
+    def _spaces(self, start: int):
+        while self.source.startswith(" ", start):
+            start += 1
+        return start
+
+    def _typed(self, start: int):
+        if not self.source.startswith("(", start):
+            return None
+        type_end = self._word(start + 1)
+        if type_end == start + 1 or not self.source.startswith(")", type_end):
+            return None
+        return self.source[start + 1 : type_end], type_end + 1
+
+    def _named(self, start: int):
+        typed = self._typed(start)
+        if typed is None:
+            return None
+        name_end = self._word(typed[1])
+        close = self._spaces(name_end)
+        if name_end == typed[1] or not self.source.startswith(self.close, close):
+            return None
+        return typed[0], self.source[typed[1] : name_end], close + len(self.close)
+
+    def token(self, start: int):
+        inner = self._spaces(start + len(self.opening))
+        if self.source.startswith(self.optional, inner):
+            named = self._named(inner + len(self.optional))
+            if named is not None:
+                return Token(start, named[2], named[0], named[1], optional=True)
+        named = self._named(inner)
+        if named is None:
+            return None
+        return Token(start, named[2], named[0], named[1], optional=False)
+
+    def tokens(self, start: int, end: int) -> "typing.Iterator[Token]":
+        start = self.source.find(self.opening, start, end)
+        while start != -1:
+            token = self.token(start)
+            if token is None:
+                start = self.source.find(self.opening, start + 1, end)
+            else:
+                yield token
+                start = self.source.find(self.opening, token.stop, end)
+
+    def position(self, offset: int):
+        line = self.source.count(self.delimiter, 0, offset)
+        return line + 1, offset - (self.source.rfind(self.delimiter, 0, offset) + 1) + 1
+
+    def slot(self, token: Token) -> Slot:
+        if token.kind == "param":
+            return Parameter(token.name, token.optional)
+        if token.kind == "ref":
+            return Reference(token.name, token.optional)
+        line, column = self.position(token.start)
+        return Invalid(
+            f'Unknown expression type "({token.kind})" at line {line}, column {column}: '
+            f'"{self.source[token.start : token.stop]}"'
+        )
+
+    def line(self, start: int, end: int) -> Line:
+        tokens = list(self.tokens(start, end))
+        references = [t for t in tokens if t.kind == "ref"]
+        if len(references) == 1:
+            (r,) = references
+            return Wrapped(self.source[start : r.start], Reference(r.name, r.optional), self.source[r.stop : end])
+        if not tokens:
+            return Text(self.source[start:end])
+        return self.row(start, end, tokens)
+
+    def row(self, start: int, end: int, tokens: "list[Token]"):
+        bounds = [start] + [b for t in tokens for b in (t.start, t.stop)] + [end]
+        return Row(
+            tuple(self.source[a:b] for a, b in zip(bounds[::2], bounds[1::2])), tuple(self.slot(t) for t in tokens)
+        )
+
+    def lines(self) -> "typing.Iterator[Line]":
+        start = 0
+        end = self.source.find(self.delimiter)
+        while end != -1:
+            yield self.line(start, end)
+            start = end + len(self.delimiter)
+            end = self.source.find(self.delimiter, start)
+        yield self.line(start, len(self.source))
+
+    @property
+    def tree(self):
+        return Tree(tuple(self.lines()))
@@ -0,0 +1,249 @@
+import dataclasses
+import functools
+import typing
+
+from .Access import viewed
+from .Node import Failed, Invalid, Parameter, Reference, Row, Tree, Wrapped, lazy
+from .Renderer import asynchronous
+
+if typing.TYPE_CHECKING:
+    from .Template import TemplateParameters, Templates
+
+Path = typing.Tuple[typing.Union[str, int], ...]
+
+
+def dotted(path: Path):
+    return "".join(f"[{p}]" if isinstance(p, int) else f".{p}" for p in path).lstrip(".")
+
+
+class InvalidParameters(TypeError):
+    def __init__(self, path: str, message: str):
+        super().__init__(path, message)
+        self.path = path
+        self.message = message
+
+    def __str__(self):
+        return f"{self.path or 'parameters'}: {self.message}"
+
+
+@dataclasses.dataclass(frozen=True)
+class Field:
+    optional: bool
+    signature: "Signature | None" = dataclasses.field(default=None, repr=False)
+
+
+def slots(tree: Tree) -> "typing.Iterator[typing.Any]":
+    for line in tree.lines:
+        if isinstance(line, Row):
+            yield from line.slots
+        elif isinstance(line, Wrapped):
+            yield line.reference
+        else:
+            yield line
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class Signature:
+    name: str
+    parameters: "dict[str, Field]" = dataclasses.field(default_factory=dict)
+    references: "dict[str, Field]" = dataclasses.field(default_factory=dict)
+    errors: "list[Exception]" = dataclasses.field(default_factory=list, repr=False)
+
+    @classmethod
+    def of(cls, tree: Tree, templates: "Templates", name: str = ""):
+        result: Signature = cls(name)
+        signatures: "dict[str, Signature]" = {}
+        pending: "list[tuple[Signature, Tree]]" = [(result, tree)]
+        while pending:
+            signature, current = pending.pop()
+            for slot in slots(current):
+                signature.add(slot, cls.target(slot, templates, signatures, pending))
+        return result
+
+    @classmethod
+    def target(
+        cls,
+        slot: typing.Any,
+        templates: "Templates",
+        signatures: "dict[str, Signature]",
+        pending: "list[tuple[Signature, Tree]]",
+    ):
+        if not isinstance(slot, Reference) or slot.name not in templates:
+            return None
+        if slot.name not in signatures:
+            signatures[slot.name] = cls(slot.name)
+            pending.append((signatures[slot.name], templates[slot.name].tree))
+        return signatures[slot.name]
+
+    def add(self, slot: typing.Any, target: "Signature | None"):
+        if isinstance(slot, Invalid):
+            self.errors.append(ValueError(slot.message))
+        elif isinstance(slot, Failed):
+            self.errors.append(slot.raised)
+        elif isinstance(slot, Reference):
+            self.field(self.references, slot, target)
+        elif isinstance(slot, Parameter):
+            self.field(self.parameters, slot, None)
+
+    def field(self, fields: "dict[str, Field]", slot: "Parameter | Reference", target: "Signature | None"):
+        optional = slot.optional and fields[slot.name].optional if slot.name in fields else slot.optional
+        fields[slot.name] = Field(optional, target)
+
+    def nested(self):
+        return [f.signature for f in self.references.values() if f.signature is not None]
+
+    def reachable(self):
+        result: "dict[int, Signature]" = {id(self): self}
+        pending: "list[Signature]" = [self]
+        while pending:
+            for signature in pending.pop().nested():
+                if id(signature) not in result:
+                    result[id(signature)] = signature
+                    pending.append(signature)
+        return list(result.values())
+
+    def referenced(self):
+        return [s.name for s in self.reachable() if s is not self]
+
+    def described(self, schemas: "dict[int, dict[str, typing.Any]]") -> "dict[str, typing.Any]":
+        result: "dict[str, typing.Any]" = {
+            name: {"kind": "param", "optional": f.optional} for name, f in self.parameters.items()
+        }
+        for name, f in self.references.items():
+            parameters = None if f.signature is None else schemas[id(f.signature)]
+            result[name] = {"kind": "ref", "optional": f.optional, "parameters": parameters}
+        return result
+
+    @property
+    def schema(self):
+        signatures = self.reachable()
+        schemas: "dict[int, dict[str, typing.Any]]" = {id(s): {} for s in signatures}
+        for signature in signatures:
+            schemas[id(signature)].update(signature.described(schemas))
+        return schemas[id(self)]
+
+    def validator(self, *, complete: bool = False):
+        return Validator(self, complete=complete)
+
+    def validate(self, parameters: "TemplateParameters", *, complete: bool = False):
+        self.validator(complete=complete)(parameters)
+
+
+absent = object()
+
+
+class Walk:
+    __slots__ = ("pending", "empty")
+
+    def __init__(self, signature: Signature, parameters: typing.Any):
+        self.pending: "list[tuple[Signature, typing.Any, Path]]" = [(signature, parameters, ())]
+        self.empty: "set[int]" = set()
+
+    def push(self, signature: Signature, parameters: typing.Any, path: Path):
+        self.pending.append((signature, parameters, path))
+
+    def defaulted(self, signature: Signature, path: Path):
+        if id(signature) not in self.empty:
+            self.empty.add(id(signature))
+            self.push(signature, {}, path)
+
+
+Check = typing.Callable[[typing.Any, Path, Walk], None]
+
+
+def unchecked(value: typing.Any):
+    return callable(value) or asynchronous(value) or (lazy(value) and not isinstance(value, (tuple, list)))
+
+
+def items(value: typing.Any) -> "typing.Sequence[typing.Any] | None":
+    if isinstance(value, list) or (isinstance(value, tuple) and not hasattr(value, "_fields")):
+        return value
+    return None
+
+
+@dataclasses.dataclass(frozen=True)
+class Validator:
+    signature: Signature
+    complete: bool = False
+
+    checks: "dict[int, tuple[tuple[str, bool, Check], ...]]" = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        object.__setattr__(self, "checks", {id(s): self.compiled(s) for s in self.signature.reachable()})
+
+    def compiled(self, signature: Signature) -> "tuple[tuple[str, bool, Check], ...]":
+        return tuple(
+            [(name, f.optional, self.parameter) for name, f in signature.parameters.items()]
+            + [(name, f.optional, self.reference(name, f.signature)) for name, f in signature.references.items()]
+        )
+
+    def reference(self, name: str, target: "Signature | None") -> Check:
+        if target is None:
+            return functools.partial(self.unknown, name)
+        return functools.partial(self.expanded, target)
+
+    def __call__(self, parameters: "TemplateParameters"):
+        walk = Walk(self.signature, parameters)
+        while walk.pending:
+            signature, p, path = walk.pending.pop()
+            self.fields(signature, viewed(p), path, walk)
+
+    def fields(self, signature: Signature, view: typing.Any, path: Path, walk: Walk):
+        if signature.errors:
+            raise signature.errors[0]
+        for name, optional, check in self.checks[id(signature)]:
+            if name in view:
+                check(view[name], path + (name,), walk)
+            elif not optional:
+                check(absent, path + (name,), walk)
+
+    def required(self, path: Path):
+        if self.complete:
+            raise InvalidParameters(dotted(path), "required parameter is missing")
+
+    def parameter(self, value: typing.Any, path: Path, _: Walk):
+        if isinstance(value, str):
+            return None
+        values = items(value)
+        if values is not None:
+            return self.strings(values, path)
+        if value is absent:
+            return self.required(path)
+        if not unchecked(value):
+            raise InvalidParameters(dotted(path), f"expected string or strings, got {type(value).__name__}")
+        return None
+
+    def strings(self, values: "typing.Sequence[typing.Any]", path: Path):
+        if set(map(type, values)) == {str}:
+            return
+        for i, v in enumerate(values):
+            if not isinstance(v, str):
+                raise InvalidParameters(dotted(path + (i,)), f"expected string, got {type(v).__name__}")
+
+    def unknown(self, name: str, *_: typing.Any):
+        raise KeyError(name)
+
+    def expanded(self, target: Signature, value: typing.Any, path: Path, walk: Walk):
+        if isinstance(value, dict):
+            return walk.push(target, value, path)
+        values = items(value)
+        if values is not None:
+            return self.each(target, values, path, walk)
+        return self.other(target, value, path, walk)
+
+    def other(self, target: Signature, value: typing.Any, path: Path, walk: Walk):
+        if value is absent:
+            self.required(path)
+            walk.defaulted(target, path)
+        elif isinstance(value, str):
+            raise InvalidParameters(dotted(path), "expected parameters, got str")
+        elif not unchecked(value):
+            walk.push(target, value, path)
+
+    def each(self, target: Signature, values: "typing.Sequence[typing.Any]", path: Path, walk: Walk):
+        for i in reversed(range(len(values))):
+            if isinstance(values[i], str):
+                raise InvalidParameters(dotted(path + (i,)), "expected parameters, got str")
+            walk.push(target, values[i], path + (i,))
@@ -1,271 +1,173 @@
-import contextlib
+import codecs
 import dataclasses
-import functools
-import re
+import io
 import typing
 
-from .Regexp import Regexp
+from .Access import viewed
+from .Batch import Batch
+from .Binder import Binder
+from .Budget import Budget
+from .Cache import Cache
+from .Compiled import Compiled
+from .Node import Tree
+from .Parallel import Parallel
+from .Profile import Profile
+from .Renderer import Renderer
+from .Scanner import Scanner
+from .Signature import Signature
+
+TemplateParameters = typing.Dict[
+    str,
+    typing.Union[
+        str,
+        typing.Iterable[str],
+        "TemplateParameters",
+        typing.Iterable["TemplateParameters"],
+        typing.Callable[[], typing.Any],
+        typing.Awaitable[typing.Any],
+        typing.AsyncIterable[typing.Any],
+    ],
+]
+Templates = typing.Mapping[str, "Template"]
 
 
 @dataclasses.dataclass(frozen=True)
-class Pattern:
+class Template:
     value: str
-
-    expression = Regexp(re.compile(".*"))
-
-    @property
-    @functools.lru_cache(maxsize=128)
-    def match(self):
-        result = self.expression.match(self.value)
-        if not result:
-            raise ValueError(f'Expression "{self.expression}"' f'does not match value "{self.value}"')
-        return result
+    tree: Tree = dataclasses.field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        self.match
-
-    @property
-    @functools.lru_cache(maxsize=128)
-    def groups(self):
-        return self.match.groupdict()
-
-    @classmethod
-    @functools.lru_cache(maxsize=128)
-    def extracted(cls, source: "Pattern"):
-        return [cls(source.value[m.start() : m.end()]) for m in cls.expression.find(source.value)]
-
-    @classmethod
-    @functools.lru_cache(maxsize=128)
-    def highlighted(cls, source: "Pattern"):
-        result: "list[Other | cls]" = []
-        last_end = 0
-        for m in cls.expression.find(source.value):
-            result += [Other(source.value[last_end : m.start()]), cls(source.value[m.start() : m.end()])]
-            last_end = m.end()
-        result.append(Other(source.value[last_end:]))
-        return [r for r in result if r.value]
-
-    def __getitem__(self, name: str):
-        return self.groups[name]
-
-    def __contains__(self, name: str):
-        return name in self.groups and self.groups[name] is not None
-
-
-class Name(Pattern):
-    expression = Regexp(re.compile("\\w+"))
-
-
-class Spaces(Pattern):
-    expression = Regexp(re.compile(" *"))
-
-
-class Open(Pattern):
-    expression = Regexp(re.compile("<!--"))
-
-
-class Close(Pattern):
-    expression = Regexp(re.compile("-->"))
-
-
-class Delimiter(Pattern):
-    expression = Regexp(re.compile("\n"))
-
-
-class Other(Pattern):
-    @property
-    def rendered(self):
-        return self.value
-
-
-class Operator(Pattern):
-    expression = Regexp(re.compile(f"\\({Name.expression}\\)"))
-
-
-class Optional(Operator):
-    expression = Regexp(re.compile(r"\(optional\)"))
-
-
-class Expression(Pattern):
-    class Type(Operator):
-        class Parameter(Operator):
-            expression = Regexp(re.compile(r"\(param\)"))
-
-        class Reference(Operator):
-            expression = Regexp(re.compile(r"\(ref\)"))
-
-    expression = Regexp.sequence(
-        Open.expression,
-        Spaces.expression,
-        Optional.expression("optional").optional,
-        Type.expression,
-        Name.expression("name"),
-        Spaces.expression,
-        Close.expression,
-    )
-
-    @property
-    @functools.lru_cache(maxsize=128)
-    def name(self):
-        return Name(self["name"])
-
-    @property
-    def optional(self):
-        return "optional" in self
-
-    @property
-    @functools.lru_cache(maxsize=128)
-    def specified(self):
-        with contextlib.suppress(ValueError):
-            return Parameter(self.value)
-        return Reference(self.value)
-
-
-class Parameter(Expression):
-    expression = Regexp.sequence(
-        Open.expression,
-        Spaces.expression,
-        Optional.expression("optional").optional,
-        Expression.Type.Parameter.expression,
-        Name.expression("name"),
-        Spaces.expression,
-        Close.expression,
-    )
-
-    def _rendered(self, parameters: typing.Union[str, "list[str]", 'list["TemplateParameters"]']):
-        if isinstance(parameters, list):
-            return parameters
-        elif isinstance(parameters, str):
-            return [parameters]
-
-    def rendered(self, parameters: "TemplateParameters", _: "Templates"):
-        try:
-            p = parameters[self.name.value]
-            if not (isinstance(p, str) or isinstance(p, list)):
-                raise TypeError
-            return self._rendered(p)
-        except KeyError:
-            if not self.optional:
-                return [""]
-            return []
-
-
-class Reference(Expression):
-    expression = Regexp.sequence(
-        Open.expression,
-        Spaces.expression,
-        Optional.expression("optional").optional,
-        Expression.Type.Reference.expression,
-        Name.expression("name"),
-        Spaces.expression,
-        Close.expression,
-    )
-
-    def inner(self, parameters: "TemplateParameters"):
-        if self.name.value in parameters:
-            return parameters[self.name.value]
-        return {}
-
-    def _rendered_optional(self, parameters: "TemplateParameters", templates: "Templates"):
-        if self.name.value not in parameters:
-            return [""]
-        elif self.name.value not in templates:
-            raise KeyError
-
-    def _rendered(self, parameters: "TemplateParameters", templates: "Templates", left: str = "", right: str = ""):
-        inner = self.inner(parameters)
-        if isinstance(inner, str):
-            raise TypeError
-        elif isinstance(inner, list):
-            result: "list[str]" = []
-            for p in inner:
-                if isinstance(p, str):
-                    raise TypeError
-                result.append(templates[self.name.value].rendered(p, templates, left, right))
-            return result
-        else:
-            return [templates[self.name.value].rendered(inner, templates, left, right)]
+        object.__setattr__(self, "tree", Scanner(self.value).tree)
 
     def rendered(
-        self, parameters: "TemplateParameters", templates: "Templates", left: str = "", right: str = ""
-    ) -> "list[str]":
-        result = self._rendered_optional(parameters, templates)
-        if self.optional and result is not None:
-            return result
-        return self._rendered(parameters, templates, left, right)
-
-
-class Line(Pattern):
-    class OneReference(Pattern):
-        expression = Regexp.sequence(
-            Other.expression.optional("left"), Reference.expression("reference"), Other.expression.optional("right")
-        )
-
-        @property
-        @functools.lru_cache(maxsize=128)
-        def left(self):
-            return Other(self["left"]).rendered
-
-        @property
-        @functools.lru_cache(maxsize=128)
-        def reference(self):
-            return Reference(self["reference"])
-
-        @property
-        @functools.lru_cache(maxsize=128)
-        def right(self):
-            return Other(self["right"]).rendered
-
-        def rendered(self, parameters: "TemplateParameters", templates: "Templates", left: str = "", right: str = ""):
-            return str(Delimiter.expression).join(
-                self.reference.rendered(parameters, templates, left + self.left, self.right + right)
-            )
-
-    @property
-    @functools.lru_cache(maxsize=128)
-    def specified(self):
-        if len(Reference.extracted(self)) == 1:
-            return Line.OneReference(self.value)
-        return self
-
-    def _rendered(self, inner: typing.Tuple[str]):
-        current = iter(inner)
-        return "".join(e.value if isinstance(e, Other) else next(current) for e in Expression.highlighted(self))
-
-    def rendered(self, parameters: "TemplateParameters", templates: "Templates", left: str, right: str):
-        extracted = Expression.extracted(self)
-        if not extracted:
-            return left + self.value + right
-        return str(Delimiter.expression).join(
-            [
-                left + self._rendered(inner) + right
-                for inner in zip(*[p.specified.rendered(parameters, templates) for p in extracted])
-            ]
-        )
+        self,
+        parameters: TemplateParameters,
+        templates: typing.Union[Templates, None] = None,
+        left: str = "",
+        right: str = "",
+        parallel: typing.Union[Parallel, None] = None,
+        cache: typing.Union[Cache, None] = None,
+        profile: typing.Union[Profile, None] = None,
+        budget: typing.Union[Budget, None] = None,
+    ):
+        return self.tree.rendered(parameters, templates or {}, left, right, parallel, cache, profile, budget=budget)
 
+    def stream(
+        self,
+        parameters: TemplateParameters,
+        templates: typing.Union[Templates, None] = None,
+        left: str = "",
+        right: str = "",
+        budget: typing.Union[Budget, None] = None,
+    ):
+        return Renderer(templates or {}, budget=budget).stream(self.tree, parameters, left, right)
 
-TemplateParameters = typing.Dict[
-    str, typing.Union[str, typing.List[str], "TemplateParameters", typing.List["TemplateParameters"]]
-]
-Templates = typing.Dict[str, "Template"]
+    async def arendered(
+        self,
+        parameters: TemplateParameters,
+        templates: typing.Union[Templates, None] = None,
+        left: str = "",
+        right: str = "",
+        cache: typing.Union[Cache, None] = None,
+        profile: typing.Union[Profile, None] = None,
+        budget: typing.Union[Budget, None] = None,
+        interval: int = 256,
+    ):
+        renderer = Renderer(templates or {}, cache=cache, profile=profile, budget=budget)
+        return await renderer.arendered(self.tree, parameters, left, right, interval=interval)
 
+    def astream(
+        self,
+        parameters: TemplateParameters,
+        templates: typing.Union[Templates, None] = None,
+        left: str = "",
+        right: str = "",
+        budget: typing.Union[Budget, None] = None,
+        interval: int = 256,
+    ):
+        return Renderer(templates or {}, budget=budget).astream(self.tree, parameters, left, right, interval=interval)
 
-class Template(Pattern):
-    expression = Regexp(re.compile("(?:.*\n)*(?:.*)?"))
+    def render_to(
+        self,
+        fp: typing.IO[str],
+        parameters: TemplateParameters,
+        templates: typing.Union[Templates, None] = None,
+        left: str = "",
+        right: str = "",
+        budget: typing.Union[Budget, None] = None,
+    ):
+        for chunk in self.stream(parameters, templates, left, right, budget):
+            fp.write(chunk)
 
-    @property
-    @functools.lru_cache(maxsize=128)
-    def lines(self):
-        return [Line(line).specified for line in self.value.split(str(Delimiter.expression))]
+    def render_into(
+        self,
+        buffer: typing.Union[bytearray, io.BufferedIOBase, typing.IO[bytes]],
+        parameters: TemplateParameters,
+        templates: typing.Union[Templates, None] = None,
+        left: str = "",
+        right: str = "",
+        encoding: str = "utf8",
+        budget: typing.Union[Budget, None] = None,
+    ):
+        write = buffer.extend if isinstance(buffer, bytearray) else buffer.write
+        encoder = codecs.getincrementalencoder(encoding)()
+        for chunk in Renderer(templates or {}, budget=budget).stream(self.tree, parameters, left, right, pieces=4096):
+            write(encoder.encode(chunk))
+        write(encoder.encode("", final=True))
 
-    def rendered(
+    def rendered_bytes(
         self,
         parameters: TemplateParameters,
         templates: typing.Union[Templates, None] = None,
         left: str = "",
         right: str = "",
+        encoding: str = "utf8",
+        budget: typing.Union[Budget, None] = None,
     ):
+        buffer = io.BytesIO()
+        self.render_into(buffer, parameters, templates, left, right, encoding, budget)
+        return buffer.getvalue()
+
+    def compiled(self, templates: typing.Union[Templates, None] = None):
         templates = templates or {}
-        return str(Delimiter.expression).join(
-            [line.rendered(parameters, templates, left, right) for line in self.lines]
+        reachable = self.signature(templates).referenced()
+        names = {name: f"_{i}" for i, name in enumerate(reachable, start=1)}
+        constants: "list[typing.Any]" = []
+        return Compiled.of(
+            [self.tree.source(Compiled.entry, names, constants)]
+            + [templates[name].tree.source(names[name], names, constants) for name in reachable],
+            constants,
         )
+
+    def signature(self, templates: typing.Union[Templates, None] = None):
+        return Signature.of(self.tree, templates or {})
+
+    def bind(self, parameters: TemplateParameters, templates: typing.Union[Templates, None] = None):
+        return BoundTemplate(self.value, parameters, templates or {}, self.tree)
+
+    def render_many(
+        self,
+        parameters: typing.Iterable[TemplateParameters],
+        templates: typing.Union[Templates, None] = None,
+        workers: typing.Union[int, None] = None,
+        chunksize: int = 256,
+    ):
+        batch = Batch(self.compiled(templates), chunksize)
+        if workers is None:
+            return batch.rendered(parameters)
+        return batch.parallel(parameters, workers)
+
+
+@dataclasses.dataclass(frozen=True)
+class BoundTemplate(Template):
+    parameters: TemplateParameters = dataclasses.field(default_factory=dict, hash=False)
+    templates: Templates = dataclasses.field(default_factory=dict, repr=False, compare=False)
+    base: typing.Union[Tree, None] = dataclasses.field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        super().__post_init__()
+        tree = self.tree if self.base is None else self.base
+        object.__setattr__(self, "tree", Binder(viewed(self.parameters), Renderer(self.templates)).tree(tree))
+
+    def bind(self, parameters: TemplateParameters, templates: typing.Union[Templates, None] = None):
+        return BoundTemplate(self.value, {**self.parameters, **parameters}, templates or self.templates, self.tree)
@@ -0,0 +1,117 @@
+import dataclasses
+import hashlib
+import inspect
+import os
+import pathlib
+import pickle
+import sys
+import tempfile
+import typing
+
+from .Node import Tree
+from .Scanner import Scanner
+from .Template import Template
+
+
+def fingerprint(*classes: type):
+    sources = [inspect.getsource(sys.modules[c.__module__]) for c in classes]
+    return hashlib.sha256("\0".join([str(pickle.HIGHEST_PROTOCOL)] + sources).encode()).hexdigest()
+
+
+@dataclasses.dataclass
+class LoaderStats:
+    memory: int = 0
+    disk: int = 0
+    parsed: int = 0
+
+
+@dataclasses.dataclass(frozen=True)
+class TemplateLoader(typing.Mapping[str, Template]):
+    root: pathlib.Path
+    cache: typing.Union[pathlib.Path, None] = None
+    pattern: str = "*"
+    encoding: str = "utf8"
+    counting: bool = False
+
+    paths: "dict[str, pathlib.Path]" = dataclasses.field(init=False, repr=False, compare=False)
+    loaded: "dict[str, Template]" = dataclasses.field(init=False, repr=False, compare=False)
+    stats: LoaderStats = dataclasses.field(init=False, repr=False, compare=False)
+
+    version = fingerprint(Tree, Scanner)
+
+    def __post_init__(self):
+        paths: "dict[str, pathlib.Path]" = {}
+        for path in sorted(self.root.rglob(self.pattern)):
+            if not path.is_file():
+                continue
+            if path.stem in paths:
+                raise ValueError(f'Template name "{path.stem}" is used by both "{paths[path.stem]}" and "{path}"')
+            paths[path.stem] = path
+        object.__setattr__(self, "paths", paths)
+        object.__setattr__(self, "loaded", {})
+        object.__setattr__(self, "stats", LoaderStats())
+        if self.cache is not None:
+            self.cache.mkdir(parents=True, exist_ok=True)
+
+    def __getitem__(self, name: str):
+        template = self.loaded.get(name)
+        if template is None:
+            return self.loaded.setdefault(name, self.load(self.paths[name]))
+        if self.counting:
+            self.stats.memory += 1
+        return template
+
+    def __contains__(self, name: object):
+        return name in self.paths
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def digest(self, data: bytes):
+        return hashlib.sha256(self.version.encode() + b"\0" + data).hexdigest()
+
+    def write(self, path: pathlib.Path, data: bytes):
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as f:
+            f.write(data)
+        os.replace(f.name, path)
+
+    def stamped(self, stamp: pathlib.Path, prefix: str):
+        if not stamp.exists():
+            return None
+        text = stamp.read_text()
+        if not text.startswith(prefix):
+            return None
+        result = stamp.with_name(f"{text[len(prefix):]}.pickle")
+        return result if result.exists() else None
+
+    def cached(self, path: pathlib.Path) -> Template:
+        self.stats.disk += 1
+        with path.open("rb") as f:
+            return pickle.load(f)
+
+    def parsed(self, path: pathlib.Path, source: bytes):
+        if path.exists():
+            return self.cached(path)
+        self.stats.parsed += 1
+        result = Template(source.decode(self.encoding))
+        self.write(path, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        return result
+
+    def load(self, path: pathlib.Path):
+        if self.cache is None:
+            self.stats.parsed += 1
+            return Template(path.read_bytes().decode(self.encoding))
+        stat = path.stat()
+        stamp = self.cache / f"{self.digest(str(path.resolve()).encode())}.stamp"
+        prefix = f"{stat.st_mtime_ns} {stat.st_size} "
+        cached = self.stamped(stamp, prefix)
+        if cached is not None:
+            return self.cached(cached)
+        source = path.read_bytes()
+        content = self.digest(source)
+        result = self.parsed(self.cache / f"{content}.pickle", source)
+        self.write(stamp, (prefix + content).encode())
+        return result
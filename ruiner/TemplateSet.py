@@ -0,0 +1,89 @@
+import dataclasses
+import typing
+
+from .Budget import Budget
+from .Cache import Cache
+from .Node import Target, Tree
+from .Parallel import Parallel
+from .Profile import Profile
+from .Template import Template, TemplateParameters, Templates
+
+
+@dataclasses.dataclass(frozen=True)
+class TemplateSet:
+    templates: Templates
+
+    targets: "dict[str, Target]" = dataclasses.field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        targets = {name: Target() for name in self.templates}
+        object.__setattr__(self, "targets", targets)
+        for name, template in self.templates.items():
+            targets[name].tree = self.link(template, name)
+        states: "dict[str, typing.Union[tuple[str, ...], bool, None]]" = {}
+        for name, target in targets.items():
+            self.resolve(name, states)
+            state = states[name]
+            target.cycle = state if isinstance(state, tuple) else ()
+
+    def resolve(self, root: str, states: "dict[str, typing.Union[tuple[str, ...], bool, None]]"):
+        path: "list[str]" = []
+        events: "list[typing.Iterator[typing.Union[str, bool]]]" = []
+        event: "typing.Union[str, bool]" = root
+        while True:
+            if isinstance(event, str) and event not in states:
+                states[event] = None
+                path.append(event)
+                events.append(self.targets[event].tree.required())
+            else:
+                self.finish(event, self.state(event, path, states), path, events, states)
+            if not path:
+                return
+            event = next(events[-1])
+
+    def state(self, event: "typing.Union[str, bool]", path: "list[str]", states: "dict[str, typing.Any]"):
+        if not isinstance(event, str):
+            return event
+        if states[event] is None:
+            return tuple(path[path.index(event) :]) + (event,)
+        return states[event]
+
+    def finish(
+        self,
+        event: "typing.Union[str, bool]",
+        state: "typing.Union[tuple[str, ...], bool]",
+        path: "list[str]",
+        events: "list[typing.Iterator[typing.Union[str, bool]]]",
+        states: "dict[str, typing.Any]",
+    ):
+        if state is True and isinstance(event, str):
+            return
+        while path:
+            states[path.pop()] = state
+            events.pop()
+            if state is True:
+                return
+
+    def link(self, template: Template, name: str = "") -> Tree:
+        try:
+            return template.tree.linked(self.targets)
+        except KeyError as e:
+            raise KeyError(f'Template "{e.args[0]}" referenced from template "{name}" not found') from e
+
+    def __getitem__(self, name: str):
+        return self.targets[name].tree
+
+    def rendered(
+        self,
+        template: typing.Union[str, Template],
+        parameters: TemplateParameters,
+        left: str = "",
+        right: str = "",
+        parallel: typing.Union[Parallel, None] = None,
+        cache: typing.Union[Cache, None] = None,
+        profile: typing.Union[Profile, None] = None,
+        budget: typing.Union[Budget, None] = None,
+    ):
+        tree = self[template] if isinstance(template, str) else self.link(template)
+        name = template if isinstance(template, str) else ""
+        return tree.rendered(parameters, {}, left, right, parallel, cache, profile, name, budget)
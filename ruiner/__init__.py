@@ -1,3 +1,34 @@
-from .Template import Template, TemplateParameters, Templates
+from .Budget import Budget, BudgetExceeded
+from .Cache import Cache, CacheStats
+from .Compiled import Compiled
+from .Incremental import Incremental
+from .Parallel import Parallel
+from .Profile import Profile, TemplateStats
+from .Renderer import Renderer
+from .Signature import InvalidParameters, Signature, Validator
+from .Template import BoundTemplate, Template, TemplateParameters, Templates
+from .TemplateLoader import LoaderStats, TemplateLoader
+from .TemplateSet import TemplateSet
 
-__all__ = ["Template", "TemplateParameters", "Templates"]
+__all__ = [
+    "BoundTemplate",
+    "Budget",
+    "BudgetExceeded",
+    "Cache",
+    "CacheStats",
+    "Compiled",
+    "Incremental",
+    "InvalidParameters",
+    "LoaderStats",
+    "Parallel",
+    "Profile",
+    "Renderer",
+    "Signature",
+    "Template",
+    "TemplateLoader",
+    "TemplateParameters",
+    "Templates",
+    "TemplateSet",
+    "TemplateStats",
+    "Validator",
+]
@@ -0,0 +1,134 @@
+import argparse
+import collections
+import contextlib
+import dataclasses
+import io
+import itertools
+import json
+import pathlib
+import sys
+import time
+import typing
+
+from .TemplateLoader import TemplateLoader
+
+if typing.TYPE_CHECKING:
+    from .Template import TemplateParameters
+
+
+@dataclasses.dataclass
+class Throughput:
+    records: int = 0
+    characters: int = 0
+    start: float = dataclasses.field(default_factory=time.perf_counter)
+
+    def add(self, rendered: str):
+        self.records += 1
+        self.characters += len(rendered)
+
+    def __str__(self):
+        seconds = time.perf_counter() - self.start
+        rate = 1 / seconds if seconds else 0.0
+        return (
+            f"{self.records} records, {self.characters} characters in {seconds:.3f} s "
+            f"({self.records * rate:.1f} records/s, {self.characters * rate:.1f} characters/s)"
+        )
+
+
+def records(lines: typing.Iterable[str]) -> "typing.Iterator[TemplateParameters]":
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            result = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {number}: {e}") from e
+        if not isinstance(result, dict):
+            raise ValueError(f"Expected JSON object on line {number}, got {type(result).__name__}")
+        yield result
+
+
+def parser():
+    result = argparse.ArgumentParser(prog="ruiner", description="Render template for each JSON Lines parameters set")
+    result.add_argument("templates", type=pathlib.Path, help="directory with templates named by file stem")
+    result.add_argument("template", help="name of template to render")
+    result.add_argument("--input", type=pathlib.Path, help="JSON Lines file with parameters (default: stdin)")
+    result.add_argument("--output", type=pathlib.Path, help="directory to write one file per record to")
+    result.add_argument("--name", default="{index}", help="output file name format, with index and record fields")
+    result.add_argument("--separator", default="\n", help="written after each record to stdout (default: newline)")
+    result.add_argument("--workers", type=int, help="number of worker processes (default: render in this process)")
+    result.add_argument("--chunksize", type=int, default=256, help="records sent to worker at once")
+    result.add_argument("--cache", type=pathlib.Path, help="directory to keep parsed templates in")
+    result.add_argument("--pattern", default="*", help="glob pattern selecting template files")
+    result.add_argument("--encoding", default="utf8", help="encoding of templates, input and output files")
+    result.add_argument("--stats", action="store_true", help="print throughput summary to stderr")
+    return result
+
+
+@contextlib.contextmanager
+def stdout(encoding: str) -> typing.Iterator[typing.TextIO]:
+    sys.stdout.flush()
+    result = io.TextIOWrapper(sys.stdout.buffer, encoding=encoding)
+    try:
+        yield result
+    finally:
+        result.detach()
+
+
+def named(arguments: argparse.Namespace, fields: "typing.Mapping[str, typing.Any]", taken: "set[str]"):
+    name = arguments.name.format_map(fields)
+    if name in ("", "..") or pathlib.Path(name).name != name:
+        raise ValueError(f'Output file name "{name}" is not a plain file name')
+    if name in taken:
+        raise ValueError(f'Output file name "{name}" is produced by more than one record')
+    taken.add(name)
+    return arguments.output / name
+
+
+def written(
+    rendered: typing.Iterable[str],
+    parameters: "typing.Iterable[TemplateParameters]",
+    arguments: argparse.Namespace,
+    out: typing.TextIO,
+) -> typing.Iterator[str]:
+    taken: "set[str]" = set()
+    for index, (result, p) in enumerate(zip(rendered, parameters)):
+        if arguments.output is None:
+            out.write(result)
+            out.write(arguments.separator)
+        else:
+            fields: "collections.ChainMap[str, typing.Any]" = collections.ChainMap({"index": index}, p)
+            named(arguments, fields, taken).write_text(result, encoding=arguments.encoding)
+        yield result
+
+
+def rendered(templates: TemplateLoader, arguments: argparse.Namespace, throughput: Throughput):
+    source = sys.stdin if arguments.input is None else arguments.input.open(encoding=arguments.encoding)
+    with source, stdout(arguments.encoding) as out:
+        parameters, fields = itertools.tee(records(source))
+        results = templates[arguments.template].render_many(
+            parameters, templates, workers=arguments.workers, chunksize=arguments.chunksize
+        )
+        for result in written(results, fields, arguments, out):
+            throughput.add(result)
+
+
+def main(argv: "list[str] | None" = None):
+    command = parser()
+    arguments = command.parse_args(argv)
+    templates = TemplateLoader(arguments.templates, arguments.cache, arguments.pattern, arguments.encoding)
+    if arguments.template not in templates:
+        command.error(f'No template named "{arguments.template}" in "{arguments.templates}"')
+    if arguments.output is not None:
+        arguments.output.mkdir(parents=True, exist_ok=True)
+    throughput = Throughput()
+    try:
+        rendered(templates, arguments, throughput)
+    except ValueError as e:
+        command.error(str(e))
+    if arguments.stats:
+        sys.stderr.write(f"{throughput}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -36,4 +36,5 @@ if __name__ == "__main__":
         maintainer="mentalblood",
         maintainer_email="neceporenkostepan@gmail.com",
         packages=packages,
+        entry_points={"console_scripts": ["ruiner = ruiner.__main__:main"]},
     )
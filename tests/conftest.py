@@ -0,0 +1,21 @@
+import pytest
+
+import ruiner
+
+
+@pytest.fixture
+def table():
+    return ruiner.Template("<table>\n    <!-- (ref)Row -->\n</table>")
+
+
+@pytest.fixture
+def templates() -> ruiner.Templates:
+    return {
+        "Row": ruiner.Template("<tr>\n    <!-- (ref)Cell -->\n</tr>"),
+        "Cell": ruiner.Template("<td><!-- (param)cell --></td>"),
+    }
+
+
+@pytest.fixture
+def flat() -> ruiner.Templates:
+    return {"Row": ruiner.Template("<tr>\n    <td><!-- (param)cell --></td>\n</tr>")}
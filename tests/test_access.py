@@ -0,0 +1,121 @@
+import collections
+import dataclasses
+import types
+import typing
+
+import pytest
+
+import ruiner
+from ruiner.Access import Access, accessors, viewed
+
+
+@dataclasses.dataclass(frozen=True)
+class Cell:
+    cell: str
+
+
+@dataclasses.dataclass(frozen=True)
+class Row:
+    Cell: "list[Cell]"
+    note: str = ""
+
+
+class Slotted:
+    __slots__ = ("cell", "_hidden")
+
+    def __init__(self, cell: str):
+        self.cell = cell
+
+
+class Derived(Slotted):
+    __slots__ = "note"
+
+
+class Plain:
+    computed = "computed"
+
+    def __init__(self, cell: str):
+        self.cell = cell
+
+
+Pair = collections.namedtuple("Pair", ["cell", "note"])
+
+
+@pytest.fixture
+def templates() -> ruiner.Templates:
+    return {
+        "Row": ruiner.Template("<tr>\n    <!-- (ref)Cell -->\n    <!-- (optional)(param)note -->\n</tr>"),
+        "Cell": ruiner.Template("<td><!-- (param)cell --></td>"),
+    }
+
+
+def methods(template: ruiner.Template, parameters: typing.Any, templates: ruiner.Templates):
+    return (
+        template.rendered(parameters, templates),
+        template.compiled(templates).rendered(parameters),
+        "".join(template.stream(parameters, templates)),
+        ruiner.TemplateSet(templates).rendered(template, parameters),
+    )
+
+
+@pytest.mark.parametrize(
+    "cells",
+    [
+        lambda: [Cell("1"), Cell("2")],
+        lambda: [Slotted("1"), Slotted("2")],
+        lambda: [Plain("1"), Plain("2")],
+        lambda: [types.MappingProxyType({"cell": "1"}), types.MappingProxyType({"cell": "2"})],
+        lambda: (Pair("1", "x"), Pair("2", "y")),
+    ],
+)
+def test_objects(
+    templates: ruiner.Templates, table: ruiner.Template, cells: typing.Callable[[], typing.Sequence[typing.Any]]
+):
+    expected = table.rendered({"Row": {"Cell": [{"cell": "1"}, {"cell": "2"}], "note": ""}}, templates)
+    assert set(methods(table, {"Row": Row(list(cells()))}, templates)) == {expected}
+
+
+def test_root(templates: ruiner.Templates):
+    expected = templates["Row"].rendered({"Cell": {"cell": "1"}, "note": "n"}, templates)
+    assert set(methods(templates["Row"], Row([Cell("1")], "n"), templates)) == {expected}
+
+
+def test_single(templates: ruiner.Templates, table: ruiner.Template):
+    expected = table.rendered({"Row": {"cell": "1", "note": "2"}}, templates)
+    assert set(methods(table, {"Row": Pair("1", "2")}, templates)) == {expected}
+
+
+def test_fields(templates: ruiner.Templates):
+    template = ruiner.Template("<!-- (param)cell -->|<!-- (param)_hidden -->|<!-- (param)note -->")
+    derived: typing.Any = Derived("1")
+    derived.note = "n"
+    assert template.rendered(derived) == "1||n"
+    assert template.rendered(typing.cast(typing.Any, Slotted("1"))) == "1||"
+    plain: typing.Any = Plain("1")
+    assert ruiner.Template("<!-- (param)cell --><!-- (param)computed -->").rendered(plain) == "1"
+    cell: typing.Any = Cell("1")
+    assert ruiner.Template("<!-- (param)__class__ -->").rendered(cell) == ""
+
+
+def test_bind(templates: ruiner.Templates):
+    bound = templates["Row"].bind(typing.cast(typing.Any, Row([Cell("1")])), templates)
+    assert bound.rendered({"note": "n"}) == templates["Row"].rendered({"Cell": {"cell": "1"}, "note": ""}, templates)
+
+
+def test_viewed():
+    assert isinstance(viewed(Cell("1")), Access)
+    assert accessors[Cell] is not None
+    parameters: typing.Any = types.MappingProxyType({})
+    assert viewed(parameters) is parameters
+    assert viewed(viewed(Cell("1"))).target == Cell("1")
+    with pytest.raises(TypeError):
+        hash(viewed(Cell("1")))
+
+
+def test_errors(templates: ruiner.Templates, table: ruiner.Template):
+    parameters: typing.Any = {"Row": 1}
+    with pytest.raises(TypeError):
+        table.rendered(parameters, templates)
+    parameters = {"cell": Cell("1")}
+    with pytest.raises(TypeError):
+        ruiner.Template("<!-- (param)cell -->").rendered(parameters)
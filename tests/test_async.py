@@ -0,0 +1,203 @@
+import asyncio
+import typing
+
+import pytest
+
+import ruiner
+from ruiner.Renderer import Rows
+
+from .test_compiled import cases
+
+
+async def produced(items: "typing.Iterable[typing.Any]"):
+    for item in items:
+        await asyncio.sleep(0)
+        yield item
+
+
+async def returned(value: typing.Any):
+    await asyncio.sleep(0)
+    return value
+
+
+async def collected(chunks: "typing.AsyncIterator[str]"):
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.parametrize(("template", "parameters", "templates"), cases)
+def test_arendered(template: str, parameters: ruiner.TemplateParameters, templates: ruiner.Templates):
+    expected = ruiner.Template(template).rendered(parameters, templates)
+    assert asyncio.run(ruiner.Template(template).arendered(parameters, templates)) == expected
+    assert "".join(asyncio.run(collected(ruiner.Template(template).astream(parameters, templates)))) == expected
+
+
+@pytest.mark.parametrize(
+    "rows",
+    [
+        lambda: produced([{"cell": "1"}, {"cell": "2"}]),
+        lambda: returned([{"cell": "1"}, {"cell": "2"}]),
+        lambda: returned(produced([{"cell": "1"}, {"cell": "2"}])),
+        lambda: lambda: returned([{"cell": "1"}, {"cell": "2"}]),
+        lambda: produced([{"cell": returned("1")}, {"cell": produced(["2"])}]),
+    ],
+)
+def test_reference(flat: ruiner.Templates, table: ruiner.Template, rows: typing.Callable[[], typing.Any]):
+    expected = table.rendered({"Row": [{"cell": "1"}, {"cell": "2"}]}, flat)
+    assert asyncio.run(table.arendered({"Row": rows()}, flat)) == expected
+
+
+@pytest.mark.parametrize(
+    ("cells", "expected"),
+    [
+        (lambda: produced(["1", "2"]), ["1", "2"]),
+        (lambda: returned(["1", "2"]), ["1", "2"]),
+        (lambda: lambda: returned(("1", "2")), ["1", "2"]),
+        (lambda: produced(str(i) for i in range(2000)), [str(i) for i in range(2000)]),
+    ],
+)
+def test_parameter(cells: typing.Callable[[], typing.Any], expected: "list[str]"):
+    template = ruiner.Template("<!-- (param)cell -->: <!-- (param)other -->")
+    other = [str(i) for i in range(5000)]
+    assert asyncio.run(template.arendered({"cell": cells(), "other": other})) == template.rendered(
+        {"cell": expected, "other": other}
+    )
+
+
+def test_inline(flat: ruiner.Templates):
+    template = ruiner.Template("<!-- (param)name -->: <!-- (ref)Row --> <!-- (ref)Cell -->")
+    flat = {**flat, "Cell": ruiner.Template("<!-- (param)cell -->")}
+    parameters: ruiner.TemplateParameters = {
+        "name": produced(["a", "b"]),
+        "Row": produced([{"cell": "1"}, {"cell": "2"}]),
+        "Cell": returned([{"cell": "x"}, {"cell": "y"}]),
+    }
+    assert asyncio.run(template.arendered(parameters, flat)) == template.rendered(
+        {"name": ["a", "b"], "Row": [{"cell": "1"}, {"cell": "2"}], "Cell": [{"cell": "x"}, {"cell": "y"}]}, flat
+    )
+
+
+def test_streamed(flat: ruiner.Templates, table: ruiner.Template):
+    fetched: "list[int]" = []
+
+    async def rows():
+        for i in range(100):
+            fetched.append(i)
+            yield {"cell": str(i)}
+
+    async def first():
+        chunks = typing.cast("typing.AsyncGenerator[str, None]", table.astream({"Row": rows()}, flat))
+        result = ""
+        async for chunk in chunks:
+            result += chunk
+            if "</tr>" in result:
+                break
+        await chunks.aclose()
+        return result
+
+    assert asyncio.run(first()) == "<table>\n    <tr>\n        <td>0</td>\n    </tr>"
+    assert len(fetched) == 1
+
+
+def test_pieces(flat: ruiner.Templates, table: ruiner.Template):
+    parameters: ruiner.TemplateParameters = {"Row": produced([{"cell": str(i)} for i in range(10)])}
+    chunks = asyncio.run(collected(ruiner.Renderer(flat).astream(table.tree, parameters, pieces=1 << 16)))
+    assert chunks == [table.rendered({"Row": [{"cell": str(i)} for i in range(10)]}, flat)]
+
+
+def test_yields(flat: ruiner.Templates, table: ruiner.Template):
+    ticks: "list[int]" = []
+
+    async def ticking():
+        while True:
+            ticks.append(len(ticks))
+            await asyncio.sleep(0)
+
+    async def render():
+        task = asyncio.create_task(ticking())
+        await asyncio.sleep(0)
+        before = len(ticks)
+        await table.arendered({"Row": [{"cell": str(i)} for i in range(5000)]}, flat, interval=64)
+        task.cancel()
+        return len(ticks) - before
+
+    assert asyncio.run(render()) > 10
+
+
+@pytest.mark.parametrize(
+    ("template", "parameters"),
+    [
+        ("<td><!-- (param)cell --></td>", {"cell": ["x"] * (20 * Rows.batch)}),
+        ("<!-- (param)a -->, <!-- (param)b -->", {"a": ["x"] * (20 * Rows.batch), "b": ["y"] * (20 * Rows.batch)}),
+    ],
+)
+def test_yields_rows(template: str, parameters: ruiner.TemplateParameters):
+    ticks: "list[int]" = []
+
+    async def ticking():
+        while True:
+            ticks.append(len(ticks))
+            await asyncio.sleep(0)
+
+    async def render():
+        task = asyncio.create_task(ticking())
+        await asyncio.sleep(0)
+        before = len(ticks)
+        await ruiner.Template(template).arendered(parameters, interval=1)
+        task.cancel()
+        return len(ticks) - before
+
+    assert asyncio.run(render()) >= 10
+
+
+def test_shared_line_nested(flat: ruiner.Templates):
+    template = ruiner.Template("<!-- (ref)Row -->|<!-- (ref)Other -->")
+    flat = {**flat, "Other": flat["Row"]}
+    parameters: ruiner.TemplateParameters = {
+        "Row": [{"cell": produced(["a", "b"])}, {"cell": returned("c")}],
+        "Other": produced([{"cell": produced(["d"])}, {"cell": "e"}]),
+    }
+    expected = template.rendered(
+        {"Row": [{"cell": ["a", "b"]}, {"cell": "c"}], "Other": [{"cell": "d"}, {"cell": "e"}]}, flat
+    )
+    assert asyncio.run(template.arendered(parameters, flat)) == expected
+
+
+def test_synchronous(flat: ruiner.Templates, table: ruiner.Template):
+    with pytest.raises(TypeError):
+        table.rendered({"Row": produced([{"cell": "1"}])}, flat)
+    with pytest.raises(TypeError):
+        ruiner.Template("<!-- (param)cell -->").rendered({"cell": produced(["1"])})
+    with pytest.raises(TypeError):
+        table.compiled(flat).rendered({"Row": produced([{"cell": "1"}])})
+
+
+def test_errors(flat: ruiner.Templates, table: ruiner.Template):
+    with pytest.raises(TypeError):
+        asyncio.run(table.arendered({"Row": produced(["string"])}, flat))
+    with pytest.raises(TypeError):
+        asyncio.run(ruiner.Template("<!-- (param)cell -->").arendered({"cell": returned({"a": "b"})}))
+
+
+def test_budget(flat: ruiner.Templates, table: ruiner.Template):
+    budget = ruiner.Budget(expansions=3)
+    with pytest.raises(ruiner.BudgetExceeded):
+        asyncio.run(table.arendered({"Row": produced([{"cell": str(i)} for i in range(5)])}, flat, budget=budget))
+    assert budget.usage.expansions == 4
+    assert asyncio.run(table.arendered({"Row": produced([{"cell": "1"}])}, flat, budget=budget))
+
+
+def test_profile(flat: ruiner.Templates, table: ruiner.Template):
+    profile = ruiner.Profile()
+    asyncio.run(table.arendered({"Row": produced([{"cell": "1"}, {"cell": "2"}])}, flat, profile=profile))
+    assert profile.templates["Row"].calls == 2
+    assert profile.templates[""].calls == 1
+
+
+def test_cache(flat: ruiner.Templates, table: ruiner.Template):
+    cache = ruiner.Cache()
+    for _ in range(2):
+        rows: "list[ruiner.TemplateParameters]" = [{"cell": produced(["1"])}, {"cell": produced(["1"])}]
+        assert asyncio.run(table.arendered({"Row": rows}, flat, cache=cache)) == table.rendered(
+            {"Row": [{"cell": "1"}, {"cell": "1"}]}, flat
+        )
+    assert cache.stats.hits == 0
@@ -0,0 +1,149 @@
+import pickle
+import typing
+
+import pytest
+
+import ruiner
+from ruiner.Node import Empty, Failed, Row, Text, Values
+
+from .test_compiled import cases
+
+
+@pytest.fixture
+def templates() -> ruiner.Templates:
+    return {
+        "Nav": ruiner.Template("<a><!-- (param)link --></a>"),
+        "Row": ruiner.Template("<tr>\n    <td><!-- (param)cell --></td>\n</tr>"),
+    }
+
+
+@pytest.fixture
+def page():
+    return ruiner.Template(
+        "<h1><!-- (param)site --></h1>\n"
+        "    <!-- (ref)Nav -->\n"
+        "<p><!-- (param)site -->: <!-- (param)body --></p>\n"
+        "<table>\n"
+        "    <!-- (ref)Row -->\n"
+        "</table>"
+    )
+
+
+@pytest.mark.parametrize(("template", "parameters", "templates"), cases)
+def test_same_as_merged(template: str, parameters: ruiner.TemplateParameters, templates: ruiner.Templates):
+    names = list(parameters)
+    for i in range(len(names) + 1):
+        bound = {name: parameters[name] for name in names[:i]}
+        dynamic = {name: parameters[name] for name in names[i:]}
+        assert ruiner.Template(template).bind(bound, templates).rendered(dynamic, templates) == ruiner.Template(
+            template
+        ).rendered(parameters, templates)
+
+
+def test_folded(templates: ruiner.Templates, page: ruiner.Template):
+    bound = page.bind({"site": "S", "Nav": [{"link": "a"}, {"link": "b"}]}, templates)
+    assert bound.tree.lines[:3] == (Text("<h1>S</h1>"), Text("    <a>a</a>"), Text("    <a>b</a>"))
+    assert bound.tree.lines[3] == Row(
+        ("<p>", ": ", "</p>"), (Values(("S",)), page.tree.lines[2].slots[1])  # type: ignore
+    )
+    assert bound.tree.lines[4:] == page.tree.lines[3:]
+
+
+def test_folded_rendered(templates: ruiner.Templates, page: ruiner.Template):
+    bound = page.bind({"site": "S", "Nav": [{"link": "a"}, {"link": "b"}]}, templates)
+    parameters: ruiner.TemplateParameters = {"body": "B", "Row": [{"cell": "1"}]}
+    assert bound.rendered(parameters, templates) == page.rendered(
+        {**parameters, "site": "S", "Nav": [{"link": "a"}, {"link": "b"}]}, templates
+    )
+    assert bound.compiled(templates).rendered(parameters) == bound.rendered(parameters, templates)
+
+
+def test_empty(templates: ruiner.Templates, page: ruiner.Template):
+    bound = page.bind({"Nav": [], "site": [], "body": []}, templates)
+    assert bound.tree.lines[1:3] == (Empty(), Empty())
+    assert bound.rendered({}, templates, "-") == page.rendered({"Nav": [], "site": [], "body": []}, templates, "-")
+    assert bound.compiled(templates).rendered({}, "-") == bound.rendered({}, templates, "-")
+
+
+def test_bound_wins(templates: ruiner.Templates, page: ruiner.Template):
+    assert page.bind({"site": "S"}, templates).rendered({"site": "X"}, templates).startswith("<h1>S</h1>")
+
+
+@pytest.mark.parametrize(
+    ("parameters", "error"),
+    [
+        ({"Nav": "string"}, TypeError),
+        ({"Nav": [{"link": "a"}, "string"]}, TypeError),
+        ({"site": {}}, TypeError),
+        ({"Missing": {}}, KeyError),
+    ],
+)
+def test_failed(templates: ruiner.Templates, parameters: ruiner.TemplateParameters, error: typing.Type[Exception]):
+    template = ruiner.Template("<!-- (param)site -->\n<!-- (ref)Nav --><!-- (ref)Missing -->\n<!-- (ref)Nav -->")
+    bound = template.bind(parameters, templates)
+    assert any(isinstance(line, Failed) for line in bound.tree.lines) or any(
+        isinstance(s, Failed) for line in bound.tree.lines if isinstance(line, Row) for s in line.slots
+    )
+    with pytest.raises(error):
+        bound.rendered({}, templates)
+    with pytest.raises(error):
+        bound.compiled(templates).rendered({})
+    with pytest.raises(error):
+        template.rendered(parameters, templates)
+
+
+class Boom(Exception):
+    pass
+
+
+def boom():
+    raise Boom("boom")
+
+
+def test_failed_custom():
+    bound = ruiner.Template("<!-- (param)a -->, <!-- (param)b -->\n<!-- (param)c -->").bind({"a": boom, "c": boom})
+    compiled = bound.compiled()
+    for rendered in (bound.rendered, compiled.rendered, pickle.loads(pickle.dumps(compiled)).rendered):
+        with pytest.raises(Boom, match="boom"):
+            rendered({"b": "x"})
+
+
+def test_values_constants():
+    value = "'\"\\n{}"
+    bound = ruiner.Template("<!-- (param)a -->, <!-- (param)b -->").bind({"a": [value, value]})
+    assert value not in bound.compiled().source
+    expected = f"{value}, 1\n{value}, 2"
+    assert bound.compiled().rendered({"b": ["1", "2"]}) == bound.rendered({"b": ["1", "2"]}) == expected
+
+
+def test_chained(templates: ruiner.Templates, page: ruiner.Template):
+    calls: "list[str]" = []
+
+    def a():
+        calls.append("a")
+        return "A"
+
+    bound = ruiner.Template("<!-- (param)a --> <!-- (param)b -->").bind({"a": a}).bind({"b": "B"})
+    assert bound.rendered({}) == bound.compiled().rendered({}) == "A B"
+    assert (bound.parameters, calls) == ({"a": a, "b": "B"}, ["a"])
+    site = page.bind({"site": "S"}, templates).bind({"Nav": [{"link": "a"}]})
+    expected = page.rendered({"site": "S", "Nav": [{"link": "a"}], "body": "x", "Row": []}, templates)
+    assert site.rendered({"body": "x", "Row": []}, templates) == expected
+
+
+def test_recursion():
+    templates = {"Self": ruiner.Template("<!-- (ref)Self -->")}
+    bound = ruiner.Template("x\n<!-- (ref)Self -->").bind({"Self": {}}, templates)
+    assert bound.tree.lines[0] == Text("x")
+    with pytest.raises(RecursionError):
+        bound.rendered({})
+    with pytest.raises(RecursionError):
+        ruiner.TemplateSet(templates).rendered(bound, {})
+
+
+def test_bound_template(templates: ruiner.Templates, page: ruiner.Template):
+    bound = page.bind({"site": "S"}, templates)
+    assert bound == page.bind({"site": "S"})
+    assert bound != page.bind({"site": "T"})
+    assert bound != page
+    assert pickle.loads(pickle.dumps(bound.tree)) == bound.tree
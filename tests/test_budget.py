@@ -0,0 +1,127 @@
+import asyncio
+import concurrent.futures
+import pickle
+
+import pytest
+
+import ruiner
+from ruiner.Renderer import Rows
+
+
+@pytest.fixture
+def parameters() -> ruiner.TemplateParameters:
+    return {"Row": [{"Cell": [{"cell": "1"}, {"cell": "2"}]} for _ in range(3)]}
+
+
+def test_unused():
+    assert (ruiner.Budget().usage.size, ruiner.Budget().usage.expansions) == (0, 0)
+
+
+def test_within(templates: ruiner.Templates, table: ruiner.Template, parameters: ruiner.TemplateParameters):
+    expected = table.rendered(parameters, templates)
+    budget = ruiner.Budget(size=len(expected), expansions=10, depth=2, seconds=60)
+    assert table.rendered(parameters, templates, budget=budget) == expected
+    assert (budget.usage.size, budget.usage.expansions) == (len(expected), 10)
+    assert table.rendered(parameters, templates, budget=budget) == expected
+
+
+@pytest.mark.parametrize(
+    ("budget", "limit"),
+    [
+        (ruiner.Budget(size=50), "size"),
+        (ruiner.Budget(expansions=9), "expansions"),
+        (ruiner.Budget(depth=1), "depth"),
+        (ruiner.Budget(seconds=0), "seconds"),
+    ],
+)
+def test_exceeded(
+    templates: ruiner.Templates,
+    table: ruiner.Template,
+    parameters: ruiner.TemplateParameters,
+    budget: ruiner.Budget,
+    limit: str,
+):
+    with pytest.raises(ruiner.BudgetExceeded, match=limit) as info:
+        table.rendered(parameters, templates, budget=budget)
+    assert info.value.limit == limit
+
+
+def test_stream(templates: ruiner.Templates, table: ruiner.Template, parameters: ruiner.TemplateParameters):
+    chunks = table.stream(parameters, templates, budget=ruiner.Budget(size=50))
+    with pytest.raises(ruiner.BudgetExceeded):
+        list(chunks)
+    with pytest.raises(ruiner.BudgetExceeded):
+        table.rendered_bytes(parameters, templates, budget=ruiner.Budget(expansions=3))
+
+
+def test_rows(templates: ruiner.Templates):
+    template = ruiner.Template("<td><!-- (param)a --><!-- (param)b --></td>")
+    parameters: ruiner.TemplateParameters = {"a": [str(i) for i in range(3000)], "b": ["x"] * 2048}
+    assert template.rendered(parameters, templates, budget=ruiner.Budget()) == template.rendered(parameters, templates)
+
+
+def test_rows_exceeded(templates: ruiner.Templates):
+    budget = ruiner.Budget(size=10000)
+    with pytest.raises(ruiner.BudgetExceeded):
+        ruiner.Template("<td><!-- (param)cell --></td>").rendered({"cell": ["x"] * 1000000}, templates, budget=budget)
+    assert budget.usage.size < 10000 + Rows.batch * len("<td>x</td>\n")
+
+
+def test_row_references(templates: ruiner.Templates):
+    template = ruiner.Template("<!-- (ref)Cell -->, <!-- (ref)Cell -->")
+    budget = ruiner.Budget()
+    parameters: ruiner.TemplateParameters = {"Cell": [{"cell": "a"}, {"cell": "b"}]}
+    result = template.rendered(parameters, templates, budget=budget)
+    assert (budget.usage.size, budget.usage.expansions) == (len(result), 5)
+
+
+def test_row_depth():
+    template = ruiner.Template("x<!-- (optional)(ref)L --><!-- (optional)(ref)M -->")
+    parameters: ruiner.TemplateParameters = {}
+    for _ in range(9):
+        parameters = {"L": parameters, "M": {}}
+    templates = {"L": template, "M": template}
+    assert template.rendered(parameters, templates, budget=ruiner.Budget(depth=9)) == "x" * 19
+    with pytest.raises(ruiner.BudgetExceeded, match="depth"):
+        template.rendered(parameters, templates, budget=ruiner.Budget(depth=8))
+
+
+def test_parallel(templates: ruiner.Templates):
+    template = ruiner.Template("<!-- (ref)Cell -->")
+    parameters: ruiner.TemplateParameters = {"Cell": [{"cell": str(i)} for i in range(50)]}
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        parallel = ruiner.Parallel(executor, threshold=1, chunksize=1)
+        with pytest.raises(ruiner.BudgetExceeded, match="expansions"):
+            template.rendered(parameters, templates, parallel=parallel, budget=ruiner.Budget(expansions=5))
+        budget = ruiner.Budget(expansions=51)
+        assert template.rendered(parameters, templates, parallel=parallel, budget=budget) == template.rendered(
+            parameters, templates
+        )
+    assert budget.usage.expansions == 51
+
+
+def test_concurrent(templates: ruiner.Templates, table: ruiner.Template, parameters: ruiner.TemplateParameters):
+    budget = ruiner.Budget(expansions=10, seconds=60)
+
+    async def gathered():
+        return await asyncio.gather(*(table.arendered(parameters, templates, budget=budget, interval=1) for _ in "ab"))
+
+    assert asyncio.run(gathered()) == [table.rendered(parameters, templates)] * 2
+
+
+def test_set(templates: ruiner.Templates):
+    with pytest.raises(ruiner.BudgetExceeded):
+        ruiner.TemplateSet(templates).rendered("Row", {"Cell": [{}] * 10}, budget=ruiner.Budget(expansions=5))
+
+
+def test_profiled(templates: ruiner.Templates, table: ruiner.Template, parameters: ruiner.TemplateParameters):
+    profile = ruiner.Profile()
+    with pytest.raises(ruiner.BudgetExceeded):
+        table.rendered(parameters, templates, profile=profile, budget=ruiner.Budget(expansions=4))
+    assert profile.templates["Cell"].calls == 2
+    assert profile.templates[""].calls == profile.templates["Row"].calls == 1
+
+
+def test_error():
+    error = pickle.loads(pickle.dumps(ruiner.BudgetExceeded("size", 10)))
+    assert (error.limit, error.value, str(error)) == ("size", 10, "Render exceeded size limit of 10")
@@ -0,0 +1,76 @@
+import gzip
+import io
+import pathlib
+import typing
+
+import pytest
+
+import ruiner
+
+from .test_compiled import cases
+
+
+@pytest.mark.parametrize(("template", "parameters", "templates"), cases)
+@pytest.mark.parametrize("encoding", ["utf8", "utf-16", "cp1251"])
+def test_same_as_encoded(
+    template: str, parameters: ruiner.TemplateParameters, templates: ruiner.Templates, encoding: str
+):
+    expected = ruiner.Template(template).rendered(parameters, templates).encode(encoding)
+    assert ruiner.Template(template).rendered_bytes(parameters, templates, encoding=encoding) == expected
+
+
+@pytest.fixture
+def templates() -> ruiner.Templates:
+    return {"Row": ruiner.Template("<tr><td>ячейка <!-- (param)cell --></td></tr>")}
+
+
+@pytest.fixture
+def parameters() -> ruiner.TemplateParameters:
+    return {"Row": [{"cell": [str(i), str(-i)]} for i in range(10000)]}
+
+
+def test_large(table: ruiner.Template, templates: ruiner.Templates, parameters: ruiner.TemplateParameters):
+    for encoding in ("utf8", "utf-16"):
+        assert table.rendered_bytes(parameters, templates, "\t", encoding=encoding) == table.rendered(
+            parameters, templates, "\t"
+        ).encode(encoding)
+
+
+def test_into_bytearray(table: ruiner.Template, templates: ruiner.Templates, parameters: ruiner.TemplateParameters):
+    buffer = bytearray(b"<!DOCTYPE html>\n")
+    table.render_into(buffer, parameters, templates)
+    assert buffer == b"<!DOCTYPE html>\n" + table.rendered(parameters, templates).encode()
+
+
+def test_into_file(
+    tmp_path: pathlib.Path, table: ruiner.Template, templates: ruiner.Templates, parameters: ruiner.TemplateParameters
+):
+    with gzip.open(tmp_path / "table.html.gz", "wb") as f:
+        table.render_into(f, parameters, templates)
+    assert gzip.decompress((tmp_path / "table.html.gz").read_bytes()) == table.rendered_bytes(parameters, templates)
+
+
+def test_errors(table: ruiner.Template, templates: ruiner.Templates):
+    buffer = io.BytesIO()
+    with pytest.raises(TypeError):
+        table.render_into(buffer, {"Row": "string"}, templates)
+    with pytest.raises(UnicodeEncodeError):
+        table.rendered_bytes({"Row": {"cell": "1"}}, templates, encoding="ascii")
+
+
+def test_into_rows():
+    class Writes(io.BytesIO):
+        def __init__(self):
+            super().__init__()
+            self.sizes: "list[int]" = []
+
+        def write(self, data: typing.Any):
+            self.sizes.append(len(data))
+            return super().write(data)
+
+    values = [str(i) for i in range(100000)]
+    template = ruiner.Template("<tr><!-- (param)a -->,<!-- (param)b --></tr>")
+    buffer = Writes()
+    template.render_into(buffer, {"a": values, "b": values})
+    assert buffer.getvalue() == template.rendered_bytes({"a": values, "b": values})
+    assert max(buffer.sizes) < len(buffer.getvalue()) // 10
@@ -0,0 +1,95 @@
+import sys
+import types
+import typing
+
+import pytest
+
+import ruiner
+
+
+@pytest.fixture
+def templates() -> ruiner.Templates:
+    return {
+        "Row": ruiner.Template("<tr>\n    <td><!-- (param)cell --></td>\n</tr>"),
+        "Cell": ruiner.Template("<!-- (param)cell -->"),
+    }
+
+
+def test_within_render(templates: ruiner.Templates, table: ruiner.Template):
+    parameters: ruiner.TemplateParameters = {
+        "Row": [{"cell": ["1", "2"]}, {"cell": ["1", "2"]}, {"cell": ["1", "2"]}, {"cell": "3"}]
+    }
+    cache = ruiner.Cache()
+    assert table.rendered(parameters, templates, cache=cache) == table.rendered(parameters, templates)
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.entries) == (2, 3, 3)
+    assert cache.stats.ratio == 0.4
+
+
+def test_across_renders(templates: ruiner.Templates, table: ruiner.Template):
+    parameters: ruiner.TemplateParameters = {"Row": {"cell": "1"}}
+    cache = ruiner.Cache()
+    first = table.rendered(parameters, templates, cache=cache)
+    assert table.rendered(parameters, templates, cache=cache) == first
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+    assert table.rendered(parameters, templates, "  ", cache=cache) == table.rendered(parameters, templates, "  ")
+    assert cache.stats.hits == 1
+
+
+def test_row_references(templates: ruiner.Templates):
+    template = ruiner.Template("<!-- (ref)Cell -->, <!-- (ref)Cell -->")
+    cache = ruiner.Cache()
+    parameters: ruiner.TemplateParameters = {"Cell": [{"cell": "a"}, {"cell": "a"}]}
+    assert template.rendered(parameters, templates, cache=cache) == "a, a\na, a"
+    assert (cache.stats.hits, cache.stats.misses) == (3, 2)
+
+
+def test_structural_key(templates: ruiner.Templates, table: ruiner.Template):
+    cache = ruiner.Cache()
+    first: typing.Any = {"Row": [{"cell": ["1"]}, {"cell": "1"}, {"cell": ["1"], "x": 1}]}
+    table.rendered(first, templates, cache=cache)
+    assert cache.stats.hits == 0
+    second: typing.Any = {"Row": [{"cell": ["1"], "x": 1}, {"x": 1, "cell": ["1"]}]}
+    table.rendered(second, templates, cache=cache)
+    assert cache.stats.hits == 2
+
+
+def test_unhashable(templates: ruiner.Templates, table: ruiner.Template):
+    cache = ruiner.Cache()
+    parameters: typing.Any = {"Row": [{"cell": "1", "x": types.SimpleNamespace()}] * 2}
+    assert table.rendered(parameters, templates, cache=cache) == table.rendered(parameters, templates)
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.entries, cache.stats.ratio) == (0, 0, 0, 0)
+
+
+def test_eviction(templates: ruiner.Templates, table: ruiner.Template):
+    cache = ruiner.Cache(maxsize=2)
+    table.rendered({"Row": [{"cell": "1"}, {"cell": "2"}, {"cell": "1"}]}, templates, cache=cache)
+    assert (cache.stats.hits, cache.stats.evictions, cache.stats.entries) == (1, 1, 2)
+    assert len(cache.entries) == 2
+
+
+def test_budget(templates: ruiner.Templates, table: ruiner.Template):
+    cache = ruiner.Cache(maxbytes=sys.getsizeof("    <tr>\n        <td>1</td>\n    </tr>") + 1)
+    table.rendered({"Row": [{"cell": "1"}, {"cell": "2"}]}, templates, cache=cache)
+    assert (cache.stats.evictions, cache.stats.entries) == (1, 1)
+    assert cache.stats.size == sys.getsizeof(next(iter(cache.entries.values()))[-1])
+    cache.clear()
+    assert (len(cache.entries), cache.stats.entries, cache.stats.size) == (0, 0, 0)
+
+
+def test_set(templates: ruiner.Templates, table: ruiner.Template):
+    parameters: ruiner.TemplateParameters = {"Row": [{"cell": "1"}, {"cell": "1"}]}
+    cache = ruiner.Cache()
+    assert ruiner.TemplateSet(templates).rendered(table, parameters, cache=cache) == table.rendered(
+        parameters, templates
+    )
+    assert cache.stats.hits == 1
+
+
+def test_templates_scope():
+    template = ruiner.Template("<!-- (ref)R -->")
+    cache = ruiner.Cache()
+    assert template.rendered({}, {"R": ruiner.Template("A")}, cache=cache) == "A"
+    assert template.rendered({}, {"R": ruiner.Template("B")}, cache=cache) == "B"
+    plain = ruiner.Template("<!-- (param)x -->")
+    assert plain.rendered({"x": "1"}, cache=cache) == plain.rendered({"x": "1"}, {}, cache=cache) == "1"
+    assert cache.stats.hits == 1
@@ -0,0 +1,67 @@
+import typing
+
+import pytest
+
+import ruiner
+
+cases: typing.List[typing.Tuple[str, ruiner.TemplateParameters, ruiner.Templates]] = [
+    ("", {}, {}),
+    ("lalala", {}, {}),
+    ("<!-- (param)x -->\n", {"x": "lalala"}, {}),
+    ("<!-- (param)x -->", {"x": ["a", "b"]}, {}),
+    ("lalala<!-- (param)p -->lololo", {}, {}),
+    ("<!-- (optional)(param)a -->", {}, {}),
+    ("<!-- (optional)(ref)r -->", {}, {"r": ruiner.Template("lalala")}),
+    ("<!-- (optional)(ref)r -->, <!-- (ref)s -->", {"s": {}}, {"r": ruiner.Template("la"), "s": ruiner.Template("lo")}),
+    ("before<!-- (param)a -->between<!-- (param)b -->after", {"a": ["1", "2", "3"], "b": ["4", "5"]}, {}),
+    (
+        "abc<!-- (ref)r1 -->de<!-- (ref)r2 -->f",
+        {"r1": {}, "r2": {}},
+        {"r1": ruiner.Template("la"), "r2": ruiner.Template("lo")},
+    ),
+    ("a<!-- (param)a --><!-- (ref)r --><!-- (foo)x -->", {"a": "A", "r": [{}, {}]}, {"r": ruiner.Template("r")}),
+    (
+        "Hello, <!-- (param)name -->!\n<!-- (ref)addition -->!\n",
+        {"name": "username", "addition": [{"action": "meet"}, {"action": "eat"}]},
+        {"addition": ruiner.Template("Nice to <!-- (param)action --> you")},
+    ),
+    (
+        "<table>\n\t<!-- (ref)Row -->\n</table>",
+        {"Row": [{"cell": ["1.1", "2.1"]}, {"cell": ["1.2", "2.2"]}]},
+        {"Row": ruiner.Template("<tr>\n\t<td><!-- (param)cell --></td>\n</tr>")},
+    ),
+]
+
+
+@pytest.mark.parametrize(("template", "parameters", "templates"), cases)
+def test_same_as_interpreted(template: str, parameters: ruiner.TemplateParameters, templates: ruiner.Templates):
+    assert ruiner.Template(template).compiled(templates).rendered(parameters) == ruiner.Template(template).rendered(
+        parameters, templates
+    )
+
+
+def test_source():
+    compiled = ruiner.Template("<!-- (ref)r -->").compiled({"r": ruiner.Template("lalala")})
+    assert "def _1(parameters, left, right):" in compiled.source
+    assert "_reference(parameters, 'r', _1, left, right, optional=False)" in compiled.source
+
+
+@pytest.mark.parametrize(
+    ("template", "parameters", "templates", "error"),
+    [
+        ("<!-- (ref)something -->", {}, {}, KeyError),
+        ("<!-- (ref)something -->", {"something": {}}, {}, KeyError),
+        ("<!-- (optional)(ref)something -->", {"something": {}}, {}, KeyError),
+        ("<!-- (ref)something -->", {"something": "string"}, {"something": ruiner.Template("la")}, TypeError),
+        ("<!-- (ref)something -->", {"something": ["string"]}, {"something": ruiner.Template("la")}, TypeError),
+        ("<!-- (param)something -->", {"something": {}}, {}, TypeError),
+        ("<!-- (foo)something -->", {}, {}, ValueError),
+    ],
+)
+def test_same_errors(
+    template: str, parameters: ruiner.TemplateParameters, templates: ruiner.Templates, error: typing.Type[Exception]
+):
+    with pytest.raises(error):
+        ruiner.Template(template).rendered(parameters, templates)
+    with pytest.raises(error):
+        ruiner.Template(template).compiled(templates).rendered(parameters)
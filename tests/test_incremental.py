@@ -0,0 +1,105 @@
+import copy
+import dataclasses
+import random
+
+import pytest
+
+import ruiner
+
+
+@pytest.fixture
+def rows():
+    return [{"Cell": [{"cell": f"{i}.{j}"} for j in range(3)]} for i in range(10)]
+
+
+def test_unchanged(templates: ruiner.Templates, table: ruiner.Template, rows: "list[ruiner.TemplateParameters]"):
+    incremental = ruiner.Incremental(table, templates)
+    parameters: ruiner.TemplateParameters = {"Row": rows}
+    assert incremental.rendered(parameters) == table.rendered(parameters, templates)
+    misses = incremental.retained.stats.misses
+    assert incremental.rendered(parameters) == table.rendered(parameters, templates)
+    assert incremental.retained.stats.misses == misses
+
+
+def test_changed(templates: ruiner.Templates, table: ruiner.Template, rows: "list[ruiner.TemplateParameters]"):
+    incremental = ruiner.Incremental(table, templates)
+    incremental.rendered({"Row": rows})
+    misses = incremental.retained.stats.misses
+    changed = rows.copy()
+    changed[5] = {"Cell": [rows[5]["Cell"][0], {"cell": "x"}]}  # type: ignore
+    assert incremental.rendered({"Row": changed}) == table.rendered({"Row": changed}, templates)
+    assert incremental.retained.stats.misses == misses + 3
+
+
+def test_structural(templates: ruiner.Templates, table: ruiner.Template, rows: "list[ruiner.TemplateParameters]"):
+    incremental = ruiner.Incremental(table, templates)
+    incremental.rendered({"Row": rows})
+    misses = incremental.retained.stats.misses
+    copied = copy.deepcopy(rows)
+    copied[2]["Cell"][1]["cell"] = "x"  # type: ignore
+    assert incremental.rendered({"Row": copied}) == table.rendered({"Row": copied}, templates)
+    assert incremental.retained.stats.misses == misses + 3
+
+
+def test_swept(templates: ruiner.Templates, table: ruiner.Template, rows: "list[ruiner.TemplateParameters]"):
+    incremental = ruiner.Incremental(table, templates)
+    incremental.rendered({"Row": rows})
+    incremental.rendered({"Row": rows[:1]})
+    assert incremental.retained.stats.entries == 1 + 1 + 3
+    assert len(incremental.retained.children) == len(incremental.retained.entries)
+    incremental.retained.clear()
+    assert not incremental.retained.shapes
+    assert incremental.rendered({"Row": rows}) == table.rendered({"Row": rows}, templates)
+
+
+def test_random(templates: ruiner.Templates, table: ruiner.Template, rows: "list[ruiner.TemplateParameters]"):
+    incremental = ruiner.Incremental(table, templates, "  ")
+    generator = random.Random(0)
+    for _ in range(100):
+        i, j = generator.randrange(len(rows)), generator.randrange(3)
+        rows = rows.copy()
+        rows[i] = {"Cell": list(rows[i]["Cell"])}  # type: ignore
+        rows[i]["Cell"][j] = {"cell": generator.choice("abc")}  # type: ignore
+        assert incremental.rendered({"Row": rows}) == table.rendered({"Row": rows}, templates, "  ")
+
+
+@dataclasses.dataclass(frozen=True)
+class Cell:
+    cell: str
+
+
+def test_objects(templates: ruiner.Templates):
+    incremental = ruiner.Incremental(ruiner.Template("<!-- (ref)Cell -->, <!-- (ref)Cell -->"), templates)
+    expected = "<td>a</td>, <td>a</td>\n<td>b</td>, <td>b</td>"
+    assert incremental.rendered({"Cell": [Cell("a"), Cell("b")]}) == expected  # type: ignore
+    misses = incremental.retained.stats.misses
+    assert incremental.rendered({"Cell": [Cell("a"), Cell("b")]}) == expected  # type: ignore
+    assert incremental.retained.stats.misses == misses
+    assert incremental.rendered({"Cell": Cell("a")}) == "<td>a</td>, <td>a</td>"  # type: ignore
+
+
+def test_unhashable(templates: ruiner.Templates, table: ruiner.Template):
+    incremental = ruiner.Incremental(table, templates)
+    for _ in range(2):
+        parameters: ruiner.TemplateParameters = {"Row": {"Cell": ({"cell": c} for c in "ab")}}
+        assert (
+            incremental.rendered(parameters)
+            == "<table>\n    <tr>\n        <td>a</td>\n        <td>b</td>\n    </tr>\n</table>"
+        )
+
+
+def test_callable():
+    counter = iter(range(1, 100))
+    incremental = ruiner.Incremental(ruiner.Template("<!-- (param)x -->"))
+    parameters: ruiner.TemplateParameters = {"x": lambda: str(next(counter))}
+    assert [incremental.rendered(parameters) for _ in range(2)] == ["1", "2"]
+    assert not incremental.retained.entries
+
+
+def test_generator(templates: ruiner.Templates, table: ruiner.Template):
+    incremental = ruiner.Incremental(table, templates)
+    parameters: ruiner.TemplateParameters = {"Row": {"Cell": ({"cell": c} for c in "ab")}}
+    expected = table.rendered({"Row": {"Cell": [{"cell": "a"}, {"cell": "b"}]}}, templates)
+    assert incremental.rendered(parameters) == expected
+    assert incremental.rendered(parameters) == table.rendered({"Row": {"Cell": []}}, templates)
+    assert not incremental.retained.entries
@@ -0,0 +1,101 @@
+import array
+import typing
+
+import pytest
+
+import ruiner
+from ruiner.Renderer import Rows
+
+
+def render(template: ruiner.Template, parameters: ruiner.TemplateParameters, templates: ruiner.Templates):
+    return template.rendered(parameters, templates)
+
+
+def stream(template: ruiner.Template, parameters: ruiner.TemplateParameters, templates: ruiner.Templates):
+    return "".join(template.stream(parameters, templates))
+
+
+def compiled(template: ruiner.Template, parameters: ruiner.TemplateParameters, templates: ruiner.Templates):
+    return template.compiled(templates).rendered(parameters)
+
+
+@pytest.mark.parametrize("method", [render, stream, compiled])
+@pytest.mark.parametrize(
+    "cells",
+    [
+        lambda: ("1", "2"),
+        lambda: (c for c in ("1", "2")),
+        lambda: array.array("u", "12"),
+        lambda: lambda: ["1", "2"],
+        lambda: lambda: iter(["1", "2"]),
+        {"1": None, "2": None}.keys,
+    ],
+)
+def test_parameter(flat: ruiner.Templates, method: typing.Callable[..., str], cells: typing.Callable[[], typing.Any]):
+    expected = method(ruiner.Template("<td><!-- (param)cell --></td>"), {"cell": ["1", "2"]}, flat)
+    assert method(ruiner.Template("<td><!-- (param)cell --></td>"), {"cell": cells()}, flat) == expected
+
+
+@pytest.mark.parametrize("method", [render, stream, compiled])
+@pytest.mark.parametrize(
+    "rows",
+    [
+        lambda: ({"cell": c} for c in ("1", "2")),
+        lambda: ({"cell": "1"}, {"cell": "2"}),
+        lambda: lambda: [{"cell": "1"}, {"cell": "2"}],
+    ],
+)
+def test_reference(
+    flat: ruiner.Templates,
+    table: ruiner.Template,
+    method: typing.Callable[..., str],
+    rows: typing.Callable[[], typing.Any],
+):
+    assert method(table, {"Row": rows()}, flat) == method(table, {"Row": [{"cell": "1"}, {"cell": "2"}]}, flat)
+
+
+@pytest.mark.parametrize("method", [render, stream, compiled])
+def test_callable_single(flat: ruiner.Templates, table: ruiner.Template, method: typing.Callable[..., str]):
+    assert method(table, {"Row": lambda: {"cell": "1"}}, flat) == method(table, {"Row": {"cell": "1"}}, flat)
+
+
+@pytest.mark.parametrize("method", [render, stream, compiled])
+def test_errors(flat: ruiner.Templates, table: ruiner.Template, method: typing.Callable[..., str]):
+    with pytest.raises(TypeError):
+        method(ruiner.Template("<!-- (param)cell -->"), {"cell": 1}, flat)
+    with pytest.raises(TypeError):
+        method(ruiner.Template("<!-- (param)cell -->"), {"cell": lambda: {"a": "b"}}, flat)
+    with pytest.raises(TypeError):
+        method(table, {"Row": ({"cell": c} if c else "string" for c in ("1", ""))}, flat)
+    with pytest.raises(TypeError):
+        method(table, {"Row": lambda: "string"}, flat)
+
+
+def test_incremental(flat: ruiner.Templates, table: ruiner.Template):
+    consumed: "list[int]" = []
+
+    def rows() -> typing.Iterator[typing.Any]:
+        for i in range(10000):
+            consumed.append(i)
+            yield {"cell": (str(j) for j in range(i % 3))}
+
+    def cells():
+        for i in range(10000):
+            consumed.append(i)
+            yield str(i)
+
+    chunks = ruiner.Template("<!-- (param)cell -->, <!-- (param)cell -->").stream({"cell": cells})
+    next(chunks)
+    assert len(consumed) <= 2 * Rows.batch
+    chunks = table.stream({"Row": rows()}, flat)
+    for _ in range(10):
+        next(chunks)
+    assert len(consumed) < 2 * Rows.batch + 10
+
+
+def test_cache(flat: ruiner.Templates, table: ruiner.Template):
+    cache = ruiner.Cache()
+    cells = ["1", "2"]
+    table.rendered({"Row": [{"cell": lambda: cells}, {"cell": lambda: cells}]}, flat, cache=cache)
+    table.rendered({"Row": [{"cell": iter(cells)}]}, flat, cache=cache)
+    assert cache.stats.hits == 0
@@ -0,0 +1,111 @@
+import os
+import pathlib
+
+import pytest
+
+import ruiner
+from ruiner.Scanner import Scanner
+
+
+@pytest.fixture
+def root(tmp_path: pathlib.Path):
+    result = tmp_path / "templates"
+    (result / "rows").mkdir(parents=True)
+    (result / "Table.html").write_text("<table>\n" "    <!-- (ref)Row -->\n" "</table>")
+    (result / "rows" / "Row.html").write_text("<tr><td><!-- (param)cell --></td></tr>\r")
+    return result
+
+
+@pytest.fixture
+def parameters() -> ruiner.TemplateParameters:
+    return {"Row": [{"cell": "1"}, {"cell": "2"}]}
+
+
+@pytest.fixture
+def expected():
+    return "<table>\n" "    <tr><td>1</td></tr>\r\n" "    <tr><td>2</td></tr>\r\n" "</table>"
+
+
+def test_loader_mapping(root: pathlib.Path):
+    loader = ruiner.TemplateLoader(root)
+    assert sorted(loader) == ["Row", "Table"]
+    assert len(loader) == 2
+    assert "Row" in loader
+    assert "Cell" not in loader
+
+
+def test_loader_lazy(root: pathlib.Path, parameters: ruiner.TemplateParameters, expected: str):
+    loader = ruiner.TemplateLoader(root)
+    assert not loader.loaded
+    assert loader["Table"].rendered(parameters, loader) == expected
+    assert loader.loaded.keys() == {"Table", "Row"}
+
+
+def test_loader_duplicate(root: pathlib.Path):
+    (root / "Row.html").write_text("")
+    with pytest.raises(ValueError, match="Row"):
+        ruiner.TemplateLoader(root)
+
+
+@pytest.fixture
+def cache(root: pathlib.Path, tmp_path: pathlib.Path, parameters: ruiner.TemplateParameters, expected: str):
+    result = tmp_path / "cache"
+    loader = ruiner.TemplateLoader(root, result)
+    assert loader["Table"].rendered(parameters, loader) == expected
+    return result
+
+
+def test_loader_version(root: pathlib.Path, cache: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(ruiner.TemplateLoader, "version", "changed")
+    loader = ruiner.TemplateLoader(root, cache)
+    assert loader["Table"] == ruiner.Template((root / "Table.html").read_text())
+    assert loader.stats == ruiner.LoaderStats(disk=0, parsed=1)
+
+
+@pytest.fixture
+def _unparsable(cache: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delattr(Scanner, "tree")
+
+
+@pytest.mark.usefixtures("_unparsable")
+def test_loader_cached(root: pathlib.Path, cache: pathlib.Path, parameters: ruiner.TemplateParameters, expected: str):
+    loader = ruiner.TemplateLoader(root, cache)
+    assert loader["Table"].rendered(parameters, loader) == expected
+
+
+@pytest.mark.usefixtures("_unparsable")
+def test_loader_touched(root: pathlib.Path, cache: pathlib.Path):
+    os.utime(root / "Table.html", ns=(0, 0))
+    assert ruiner.TemplateLoader(root, cache)["Table"].value == (root / "Table.html").read_text()
+
+
+@pytest.mark.usefixtures("_unparsable")
+def test_loader_stamp_broken(root: pathlib.Path, cache: pathlib.Path):
+    for stamp in cache.glob("*.stamp"):
+        stamp.write_text("")
+    assert ruiner.TemplateLoader(root, cache)["Table"].value == (root / "Table.html").read_text()
+
+
+def test_loader_changed(root: pathlib.Path, cache: pathlib.Path):
+    (root / "Table.html").write_text("<!-- (ref)Row -->")
+    assert ruiner.TemplateLoader(root, cache)["Table"] == ruiner.Template("<!-- (ref)Row -->")
+
+
+def test_loader_cache_removed(root: pathlib.Path, cache: pathlib.Path):
+    for cached in cache.glob("*.pickle"):
+        cached.unlink()
+    assert ruiner.TemplateLoader(root, cache)["Table"] == ruiner.Template((root / "Table.html").read_text())
+
+
+def test_loader_stats(root: pathlib.Path, cache: pathlib.Path, parameters: ruiner.TemplateParameters):
+    loader = ruiner.TemplateLoader(root, cache, counting=True)
+    loader["Table"].rendered(parameters, loader)
+    loader["Table"].rendered(parameters, loader)
+    assert loader.stats == ruiner.LoaderStats(memory=2, disk=2, parsed=0)
+    uncounted = ruiner.TemplateLoader(root, cache)
+    uncounted["Table"].rendered(parameters, uncounted)
+    uncounted["Table"].rendered(parameters, uncounted)
+    assert uncounted.stats == ruiner.LoaderStats(memory=0, disk=2, parsed=0)
+    uncached = ruiner.TemplateLoader(root)
+    uncached["Table"].rendered(parameters, uncached)
+    assert uncached.stats == ruiner.LoaderStats(memory=0, disk=0, parsed=2)
@@ -0,0 +1,112 @@
+import io
+import json
+import pathlib
+import runpy
+import sys
+
+import pytest
+
+import ruiner
+from ruiner.__main__ import main
+
+
+@pytest.fixture
+def directory(tmp_path: pathlib.Path):
+    result = tmp_path / "templates"
+    result.mkdir()
+    (result / "Table.html").write_text("<table>\n    <!-- (ref)Row -->\n</table>")
+    (result / "Row.html").write_text("<tr><!-- (param)cell --></tr>")
+    return result
+
+
+def records(number: int) -> "list[ruiner.TemplateParameters]":
+    return [{"id": f"r{i}", "Row": [{"cell": str(j)} for j in range(i % 3)]} for i in range(number)]
+
+
+def expected(directory: pathlib.Path, number: int):
+    templates = ruiner.TemplateLoader(directory)
+    return [templates["Table"].rendered(p, templates) for p in records(number)]
+
+
+def failed(argv: "list[str]", capsys: "pytest.CaptureFixture[str]"):
+    with pytest.raises(SystemExit) as info:
+        main(argv)
+    assert info.value.code == 2
+    return capsys.readouterr().err
+
+
+@pytest.fixture
+def source(tmp_path: pathlib.Path):
+    result = tmp_path / "records.jsonl"
+    result.write_text("".join(json.dumps(p) + "\n\n" for p in records(10)))
+    return result
+
+
+@pytest.mark.parametrize("workers", [[], ["--workers", "2"]])
+def test_stdout(
+    directory: pathlib.Path, source: pathlib.Path, workers: "list[str]", capsys: "pytest.CaptureFixture[str]"
+):
+    main([str(directory), "Table", "--input", str(source), "--chunksize", "3", "--separator", "\0"] + workers)
+    assert capsys.readouterr().out.split("\0")[:-1] == expected(directory, 10)
+
+
+def test_output(directory: pathlib.Path, source: pathlib.Path, tmp_path: pathlib.Path):
+    main([str(directory), "Table", "--input", str(source), "--output", str(tmp_path / "out"), "--name", "{id}.html"])
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == sorted(f"r{i}.html" for i in range(10))
+    assert (tmp_path / "out" / "r4.html").read_text() == expected(directory, 5)[4]
+    main([str(directory), "Table", "--input", str(source), "--output", str(tmp_path / "indexed")])
+    assert (tmp_path / "indexed" / "7").read_text() == expected(directory, 8)[7]
+
+
+def test_encoding(directory: pathlib.Path, tmp_path: pathlib.Path, capsysbinary: "pytest.CaptureFixture[bytes]"):
+    (tmp_path / "latin.jsonl").write_text('{"Row": {"cell": "caf\u00e9"}}\n', encoding="latin-1")
+    main([str(directory), "Table", "--input", str(tmp_path / "latin.jsonl"), "--encoding", "latin-1"])
+    assert capsysbinary.readouterr().out == "<table>\n    <tr>caf\u00e9</tr>\n</table>\n".encode("latin-1")
+
+
+@pytest.mark.parametrize("name", ["../{id}", "{id}/x", str(pathlib.Path("/{id}").absolute()), "..", ".", ""])
+def test_names(
+    directory: pathlib.Path,
+    source: pathlib.Path,
+    tmp_path: pathlib.Path,
+    name: str,
+    capsys: "pytest.CaptureFixture[str]",
+):
+    arguments = [str(directory), "Table", "--input", str(source), "--output", str(tmp_path / "out"), "--name", name]
+    assert "is not a plain file name" in failed(arguments, capsys)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out", "records.jsonl", "templates"]
+    assert not list((tmp_path / "out").iterdir())
+
+
+def test_collision(
+    directory: pathlib.Path, source: pathlib.Path, tmp_path: pathlib.Path, capsys: "pytest.CaptureFixture[str]"
+):
+    arguments = [str(directory), "Table", "--input", str(source), "--output", str(tmp_path / "out"), "--name", "x"]
+    assert 'error: Output file name "x" is produced by more than one record' in failed(arguments, capsys)
+    assert [p.name for p in (tmp_path / "out").iterdir()] == ["x"]
+
+
+def test_unreachable(directory: pathlib.Path, source: pathlib.Path, capsys: "pytest.CaptureFixture[str]"):
+    (directory / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n\xff")
+    main([str(directory), "Table", "--input", str(source), "--separator", "\0"])
+    assert capsys.readouterr().out.split("\0")[:-1] == expected(directory, 10)
+
+
+def test_stdin(directory: pathlib.Path, monkeypatch: pytest.MonkeyPatch, capsys: "pytest.CaptureFixture[str]"):
+    monkeypatch.setattr(sys, "argv", ["ruiner", str(directory), "Table", "--stats"])
+    monkeypatch.setattr(sys, "stdin", io.StringIO('{"Row": {"cell": "1"}}\n'))
+    monkeypatch.delitem(sys.modules, "ruiner.__main__", raising=False)
+    runpy.run_module("ruiner", run_name="__main__")
+    output = capsys.readouterr()
+    assert output.out == "<table>\n    <tr>1</tr>\n</table>\n"
+    assert output.err.startswith("1 records, 31 characters in ")
+
+
+def test_errors(directory: pathlib.Path, tmp_path: pathlib.Path, capsys: "pytest.CaptureFixture[str]"):
+    assert 'No template named "Missing"' in failed([str(directory), "Missing"], capsys)
+    (tmp_path / "invalid.jsonl").write_text('{"Row": []}\n{"Row": \n')
+    arguments = [str(directory), "Table", "--input", str(tmp_path / "invalid.jsonl")]
+    assert "error: Invalid JSON on line 2" in failed(arguments, capsys)
+    (tmp_path / "list.jsonl").write_text('{"Row": []}\n[1]\n')
+    arguments = [str(directory), "Table", "--input", str(tmp_path / "list.jsonl"), "--output", str(tmp_path / "out")]
+    assert "error: Expected JSON object on line 2, got list" in failed(arguments, capsys)
@@ -0,0 +1,44 @@
+import itertools
+import pathlib
+import pickle
+import typing
+
+import pytest
+
+import ruiner
+
+
+def parameters(number: int) -> "list[ruiner.TemplateParameters]":
+    return [{"Row": [{"cell": [str(i), str(j)]} for j in range(i % 3)]} for i in range(number)]
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+@pytest.mark.parametrize("number", [0, 1, 10, 100])
+def test_render_many(table: ruiner.Template, flat: ruiner.Templates, workers: "int | None", number: int):
+    assert list(table.render_many(parameters(number), flat, workers=workers, chunksize=3)) == [
+        table.rendered(p, flat) for p in parameters(number)
+    ]
+
+
+def test_render_many_lazy(table: ruiner.Template, flat: ruiner.Templates):
+    infinite: typing.Iterator[ruiner.TemplateParameters] = ({"Row": {"cell": str(i)}} for i in itertools.count())
+    assert list(itertools.islice(table.render_many(infinite, flat, chunksize=2), 3)) == [
+        f"<table>\n    <tr>\n        <td>{i}</td>\n    </tr>\n</table>" for i in range(3)
+    ]
+
+
+def test_compiled_pickle(table: ruiner.Template, flat: ruiner.Templates):
+    compiled = table.compiled(flat)
+    restored = pickle.loads(pickle.dumps(compiled))
+    assert restored == compiled
+    assert restored.rendered(parameters(3)[2]) == compiled.rendered(parameters(3)[2])
+
+
+def test_compiled_reachable(table: ruiner.Template, flat: ruiner.Templates, tmp_path: pathlib.Path):
+    (tmp_path / "Row.html").write_text(flat["Row"].value)
+    (tmp_path / "Unused.html").write_text("<!-- (param)unused -->")
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n\xff")
+    loader = ruiner.TemplateLoader(tmp_path)
+    assert list(table.render_many(parameters(3), loader)) == [table.rendered(p, flat) for p in parameters(3)]
+    assert set(loader.loaded) == {"Row"}
+    assert "unused" not in table.compiled({**flat, "Unused": ruiner.Template("<!-- (param)unused -->")}).source
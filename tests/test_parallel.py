@@ -0,0 +1,41 @@
+import concurrent.futures
+import pickle
+import typing
+
+import pytest
+
+import ruiner
+
+
+@pytest.fixture(params=[concurrent.futures.ThreadPoolExecutor, concurrent.futures.ProcessPoolExecutor])
+def executor(request: pytest.FixtureRequest) -> typing.Iterator[concurrent.futures.Executor]:
+    with request.param(2) as result:
+        yield result
+
+
+@pytest.mark.parametrize("rows", [0, 1, 2, 3, 10])
+def test_parallel(
+    executor: concurrent.futures.Executor, table: ruiner.Template, templates: ruiner.Templates, rows: int
+):
+    parameters: ruiner.TemplateParameters = {
+        "Row": [{"Cell": [{"cell": f"{x}.{y}"} for x in range(3)]} for y in range(rows)]
+    }
+    assert table.rendered(
+        parameters, templates, parallel=ruiner.Parallel(executor, threshold=2, chunksize=2)
+    ) == table.rendered(parameters, templates)
+
+
+def test_parallel_error(executor: concurrent.futures.Executor, templates: ruiner.Templates):
+    with pytest.raises(TypeError):
+        ruiner.Template("<!-- (ref)Cell -->").rendered(
+            {"Cell": [{"cell": "1"}, {"cell": {}}, {"cell": "3"}]},
+            templates,
+            parallel=ruiner.Parallel(executor, threshold=1, chunksize=1),
+        )
+
+
+def test_pickle():
+    template = ruiner.Template("a<!-- (param)b -->c\n" "    <!-- (optional)(ref)d -->\n" "<!-- (e)f -->")
+    restored = pickle.loads(pickle.dumps(template))
+    assert restored == template
+    assert restored.tree == template.tree
@@ -0,0 +1,128 @@
+import asyncio
+import typing
+
+import pytest
+
+import ruiner
+
+
+@pytest.fixture
+def templates() -> ruiner.Templates:
+    return {
+        "Row": ruiner.Template("<tr>\n    <!-- (ref)Cell -->\n</tr>"),
+        "Cell": ruiner.Template("<td><!-- (param)cell --></td>\n<!-- (optional)(ref)Mark -->"),
+        "Mark": ruiner.Template("*"),
+    }
+
+
+@pytest.fixture
+def parameters() -> ruiner.TemplateParameters:
+    return {"Row": [{"Cell": [{"cell": "1", "Mark": {}}, {"cell": "2"}]}, {"Cell": {"cell": "3"}}]}
+
+
+def test_counts(templates: ruiner.Templates, table: ruiner.Template, parameters: ruiner.TemplateParameters):
+    profile = ruiner.Profile()
+    result = table.rendered(parameters, templates, profile=profile)
+    assert result == table.rendered(parameters, templates)
+    assert {name: stats.calls for name, stats in profile.templates.items()} == {"": 1, "Row": 2, "Cell": 3, "Mark": 1}
+
+
+def test_sizes(templates: ruiner.Templates, table: ruiner.Template, parameters: ruiner.TemplateParameters):
+    profile = ruiner.Profile()
+    result = table.rendered(parameters, templates, profile=profile)
+    assert profile.templates[""].size == len(result)
+    assert profile.templates["Mark"].size == len("        *")
+    assert profile.templates["Cell"].size == 3 * len("        <td>1</td>\n") + len("        *")
+
+
+def test_times(templates: ruiner.Templates, table: ruiner.Template, parameters: ruiner.TemplateParameters):
+    profile = ruiner.Profile()
+    table.rendered(parameters, templates, profile=profile)
+    root, row, cell = profile.templates[""], profile.templates["Row"], profile.templates["Cell"]
+    assert root.total >= row.total + root.own
+    assert row.total >= cell.total >= profile.templates["Mark"].total
+    assert all(0 <= s.own <= s.total for s in profile.templates.values())
+    profile.clear()
+    assert not profile.templates
+
+
+def test_hook(templates: ruiner.Templates, table: ruiner.Template, parameters: ruiner.TemplateParameters):
+    calls: "list[typing.Tuple[str, ruiner.TemplateStats]]" = []
+    profile = ruiner.Profile(lambda name, stats: calls.append((name, stats)))
+    table.rendered(parameters, templates, profile=profile)
+    assert [name for name, _ in calls] == ["Mark", "Cell", "Cell", "Row", "Cell", "Row", ""]
+    assert all(stats.calls == 1 for _, stats in calls)
+    assert calls[-1][1].size == len(table.rendered(parameters, templates))
+
+
+def test_row_references(templates: ruiner.Templates):
+    profile = ruiner.Profile()
+    assert ruiner.Template("<!-- (ref)Mark -->, <!-- (ref)Mark -->").rendered({}, templates, profile=profile) == "*, *"
+    assert (profile.templates[""].size, profile.templates["Mark"].calls, profile.templates["Mark"].size) == (4, 2, 2)
+
+
+def test_set(templates: ruiner.Templates, parameters: ruiner.TemplateParameters):
+    profile = ruiner.Profile()
+    ruiner.TemplateSet(templates).rendered("Row", parameters["Row"][0], profile=profile)  # type: ignore
+    assert profile.templates.keys() == {"Row", "Cell", "Mark"}
+
+
+def test_error(templates: ruiner.Templates, table: ruiner.Template):
+    calls: "list[str]" = []
+    profile = ruiner.Profile(lambda name, _: calls.append(name))
+    with pytest.raises(TypeError):
+        table.rendered({"Row": {"Cell": [{"cell": "1"}, {"cell": {}}]}}, templates, profile=profile)
+    assert {name: stats.calls for name, stats in profile.templates.items()} == {"": 1, "Row": 1, "Cell": 2}
+    assert calls == ["Cell"]
+
+
+def test_recursion():
+    template = ruiner.Template("x<!-- (optional)(ref)L --><!-- (optional)(ref)M -->")
+    parameters: ruiner.TemplateParameters = {}
+    for _ in range(1001):
+        parameters = {"L": parameters, "M": {}}
+    profile = ruiner.Profile()
+    with pytest.raises(RecursionError, match="1000"):
+        template.rendered(parameters, {"L": template, "M": template}, profile=profile)
+    assert profile.templates["L"].calls == 1000
+
+
+def test_concurrent(templates: ruiner.Templates, table: ruiner.Template):
+    profile = ruiner.Profile()
+
+    def parameters(size: int) -> ruiner.TemplateParameters:
+        return {"Row": [{"Cell": [{"cell": "x" * size} for _ in range(50)]} for _ in range(50)]}
+
+    async def rendered(size: int):
+        return await table.arendered(parameters(size), templates, profile=profile, interval=7)
+
+    async def gathered():
+        return await asyncio.gather(rendered(1), rendered(2), rendered(3))
+
+    results = asyncio.run(gathered())
+    expected = ruiner.Profile()
+    for size in (1, 2, 3):
+        asyncio.run(table.arendered(parameters(size), templates, profile=expected))
+    assert profile.templates[""].size == sum(map(len, results))
+    assert {n: (s.calls, s.size) for n, s in profile.templates.items()} == {
+        n: (s.calls, s.size) for n, s in expected.templates.items()
+    }
+
+
+def test_stream(templates: ruiner.Templates, table: ruiner.Template, parameters: ruiner.TemplateParameters):
+    profile = ruiner.Profile()
+    chunks = typing.cast(
+        "typing.Generator[str, None, None]", ruiner.Renderer(templates, profile=profile).stream(table.tree, parameters)
+    )
+    first = next(chunks)
+    assert not profile.templates
+    chunks.close()
+    assert profile.templates[""].size == len(first)
+
+
+def test_cached(templates: ruiner.Templates, table: ruiner.Template, parameters: ruiner.TemplateParameters):
+    profile = ruiner.Profile()
+    cache = ruiner.Cache()
+    table.rendered(parameters, templates, cache=cache, profile=profile)
+    assert table.rendered(parameters, templates, cache=cache, profile=profile) == table.rendered(parameters, templates)
+    assert profile.templates["Row"].calls == 2
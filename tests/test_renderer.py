@@ -0,0 +1,52 @@
+import pytest
+
+import ruiner
+
+
+def nested(depth: int):
+    templates: ruiner.Templates = {"Level": ruiner.Template("<!-- (param)x -->\n<!-- (optional)(ref)Level -->")}
+    parameters: ruiner.TemplateParameters = {"x": "0"}
+    for i in range(1, depth):
+        parameters = {"x": str(i), "Level": parameters}
+    return templates, parameters
+
+
+def test_deep():
+    templates, parameters = nested(2000)
+    result = ruiner.Renderer(templates, depth=2000).rendered(templates["Level"].tree, parameters)
+    assert result.split("\n") == [str(i) for i in reversed(range(2000))] + [""]
+
+
+def test_too_deep():
+    templates, parameters = nested(1002)
+    with pytest.raises(RecursionError, match="1000"):
+        templates["Level"].rendered(parameters, templates)
+
+
+def test_stream():
+    templates, parameters = nested(3)
+    assert list(ruiner.Renderer(templates).stream(templates["Level"].tree, parameters)) == ["2\n", "1\n", "0\n"]
+
+
+def paired(depth: int):
+    template = ruiner.Template("x<!-- (optional)(ref)L --><!-- (optional)(ref)M -->")
+    parameters: ruiner.TemplateParameters = {}
+    for _ in range(depth - 1):
+        parameters = {"L": parameters, "M": {}}
+    return {"L": template, "M": template}, parameters
+
+
+def test_deep_row():
+    templates, parameters = paired(3000)
+    assert ruiner.Renderer(templates, depth=3000).rendered(templates["L"].tree, parameters) == "x" * 5999
+
+
+def test_too_deep_row():
+    templates, parameters = paired(1002)
+    with pytest.raises(RecursionError, match="1000"):
+        templates["L"].rendered(parameters, templates)
+
+
+def test_stream_row():
+    templates, parameters = paired(3)
+    assert list(ruiner.Renderer(templates).stream(templates["L"].tree, parameters)) == ["x", "x", "x", "x", "x"]
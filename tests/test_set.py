@@ -0,0 +1,100 @@
+import concurrent.futures
+import pickle
+
+import pytest
+
+import ruiner
+
+
+@pytest.fixture
+def templates():
+    return {
+        "Table": ruiner.Template("<table>\n" "    <!-- (ref)Row -->\n" "</table>"),
+        "Row": ruiner.Template(
+            "<tr>\n" "    <td><!-- (param)cell --></td><!-- (optional)(ref)Note --><!-- (ref)Note -->\n" "</tr>"
+        ),
+        "Note": ruiner.Template("<!-- (optional)(param)text -->"),
+    }
+
+
+@pytest.fixture
+def parameters() -> ruiner.TemplateParameters:
+    return {"Row": [{"cell": ["1", "2"], "Note": {"text": "a"}}, {"cell": "3"}]}
+
+
+def test_set(templates: ruiner.Templates, parameters: ruiner.TemplateParameters):
+    assert ruiner.TemplateSet(templates).rendered("Table", parameters) == templates["Table"].rendered(
+        parameters, templates
+    )
+
+
+def test_set_outer(templates: ruiner.Templates, parameters: ruiner.TemplateParameters):
+    outer = ruiner.Template("<body>\n" "    <!-- (ref)Table -->\n" "</body>")
+    assert ruiner.TemplateSet(templates).rendered(outer, {"Table": parameters}) == outer.rendered(
+        {"Table": parameters}, templates
+    )
+
+
+def test_set_missing():
+    with pytest.raises(KeyError, match='"Cell" referenced from template "Row"'):
+        ruiner.TemplateSet({"Row": ruiner.Template("<!-- (optional)(ref)Cell -->")})
+    with pytest.raises(KeyError, match="Cell"):
+        ruiner.TemplateSet({}).rendered(ruiner.Template("<!-- (ref)Cell -->"), {})
+
+
+def test_set_recursion():
+    templates = ruiner.TemplateSet({"Self": ruiner.Template("<!-- (ref)Self -->")})
+    assert templates["Self"].lines[0].reference.target.cycle == ("Self", "Self")  # type: ignore
+    with pytest.raises(RecursionError, match="Self -> Self"):
+        templates.rendered("Self", {})
+
+
+def test_set_recursion_deep():
+    templates = {
+        "A": ruiner.Template("a<!-- (param)x --><!-- (ref)B -->"),
+        "B": ruiner.Template("<!-- (ref)C -->"),
+        "C": ruiner.Template("<!-- (optional)(ref)A -->\n<!-- (ref)B -->"),
+    }
+    with pytest.raises(RecursionError, match="B -> C -> B"):
+        ruiner.TemplateSet(templates).rendered("A", {})
+    parameters: ruiner.TemplateParameters = {"A": {"x": "1", "B": {"C": {"B": []}}}, "B": []}
+    assert ruiner.TemplateSet(templates).rendered("C", parameters) == templates["C"].rendered(parameters, templates)
+
+
+def test_set_recursion_unexpanded():
+    template = ruiner.Template("<!-- (optional)(param)x --><!-- (ref)A --><!-- (ref)B -->")
+    templates = {"A": template, "B": ruiner.Template("b")}
+    assert ruiner.TemplateSet(templates).rendered("A", {}) == template.rendered({}, templates) == ""
+    with pytest.raises(RecursionError, match="A -> A"):
+        ruiner.TemplateSet(templates).rendered("A", {"x": "1"})
+
+
+def test_set_recursion_data():
+    templates = {"Menu": ruiner.Template("<li><!-- (param)name --></li>\n<ul>\n    <!-- (ref)Menu -->\n</ul>")}
+    parameters: ruiner.TemplateParameters = {"name": "a", "Menu": [{"name": "b", "Menu": []}]}
+    assert ruiner.TemplateSet(templates).rendered("Menu", parameters) == templates["Menu"].rendered(
+        parameters, templates
+    )
+
+
+def test_set_recursion_invalid():
+    templates = ruiner.TemplateSet(
+        {
+            "Self": ruiner.Template("<!-- (foo)x --><!-- (param)y -->\n<!-- (ref)Self -->"),
+            "Row": ruiner.Template("<!-- (ref)Self --><!-- (ref)Row -->"),
+        }
+    )
+    with pytest.raises(ValueError, match="foo"):
+        templates.rendered("Row", {})
+
+
+def test_set_pickle(templates: ruiner.Templates, parameters: ruiner.TemplateParameters):
+    linked = ruiner.TemplateSet(templates)["Table"]
+    assert pickle.loads(pickle.dumps(linked)).rendered(parameters, {}) == linked.rendered(parameters, {})
+
+
+def test_set_parallel(templates: ruiner.Templates, parameters: ruiner.TemplateParameters):
+    with concurrent.futures.ProcessPoolExecutor(2) as executor:
+        assert ruiner.TemplateSet(templates).rendered(
+            "Table", parameters, parallel=ruiner.Parallel(executor, threshold=1, chunksize=1)
+        ) == templates["Table"].rendered(parameters, templates)
@@ -0,0 +1,145 @@
+import dataclasses
+import typing
+
+import pytest
+
+import ruiner
+
+from .test_compiled import cases
+
+
+@pytest.fixture
+def templates() -> ruiner.Templates:
+    return {
+        "Row": ruiner.Template("<tr>\n    <!-- (ref)Cell --><!-- (optional)(ref)Note -->\n</tr>"),
+        "Cell": ruiner.Template("<td><!-- (param)cell --></td>\n<!-- (optional)(param)title -->"),
+        "Note": ruiner.Template("<!-- (optional)(param)text --><!-- (optional)(ref)Note -->"),
+    }
+
+
+@pytest.mark.parametrize(("template", "parameters", "templates"), cases)
+def test_valid(template: str, parameters: ruiner.TemplateParameters, templates: ruiner.Templates):
+    ruiner.Template(template).signature(templates).validate(parameters)
+
+
+@pytest.mark.parametrize(
+    ("parameters", "error", "path"),
+    [
+        ({"Row": "string"}, ruiner.InvalidParameters, "Row"),
+        ({"Row": ["string"]}, ruiner.InvalidParameters, "Row[0]"),
+        ({"Row": {"Cell": {"cell": 1}}}, ruiner.InvalidParameters, "Row.Cell.cell"),
+        ({"Row": {"Cell": {"cell": {}}}}, ruiner.InvalidParameters, "Row.Cell.cell"),
+        ({"Row": [{}, {"Cell": [{"cell": ["1", 2]}]}]}, ruiner.InvalidParameters, "Row[1].Cell[0].cell[1]"),
+        ({"Row": {"Note": {"Note": {"Note": "string"}}}}, ruiner.InvalidParameters, "Row.Note.Note.Note"),
+        ({"Row": {"Cell": {"title": ("a", None)}}}, ruiner.InvalidParameters, "Row.Cell.title[1]"),
+    ],
+)
+def test_invalid(
+    templates: ruiner.Templates,
+    table: ruiner.Template,
+    parameters: ruiner.TemplateParameters,
+    error: typing.Type[Exception],
+    path: str,
+):
+    with pytest.raises(error) as info:
+        table.signature(templates).validate(parameters)
+    assert info.value.path == path  # type: ignore
+    assert str(info.value).startswith(f"{path}: expected ")
+    with pytest.raises(TypeError):
+        table.rendered(parameters, templates)
+
+
+@pytest.mark.parametrize(
+    ("template", "parameters", "templates", "error"),
+    [
+        ("<!-- (ref)something -->", {}, {}, KeyError),
+        ("<!-- (ref)something -->", {"something": {}}, {}, KeyError),
+        ("<!-- (optional)(ref)something -->", {"something": {}}, {}, KeyError),
+        ("<!-- (ref)r -->", {}, {"r": ruiner.Template("<!-- (ref)missing -->")}, KeyError),
+        ("<!-- (ref)something -->", {"something": "string"}, {"something": ruiner.Template("la")}, TypeError),
+        ("<!-- (param)something -->", {"something": {}}, {}, TypeError),
+        ("<!-- (foo)something -->", {}, {}, ValueError),
+        ("<!-- (ref)r -->", {"r": [{}]}, {"r": ruiner.Template("a\n<!-- (foo)x -->")}, ValueError),
+    ],
+)
+def test_same_errors(
+    template: str, parameters: ruiner.TemplateParameters, templates: ruiner.Templates, error: typing.Type[Exception]
+):
+    with pytest.raises(error):
+        ruiner.Template(template).signature(templates).validate(parameters)
+    with pytest.raises(error):
+        ruiner.Template(template).rendered(parameters, templates)
+
+
+def test_skipped(templates: ruiner.Templates, table: ruiner.Template):
+    ruiner.Template("<!-- (optional)(ref)something -->").signature().validate({})
+    ruiner.Template("<!-- (ref)r -->").signature({"r": ruiner.Template("<!-- (foo)x -->")}).validate({"r": []})
+    rows = ({"Cell": {"cell": str(i)}} for i in range(3))
+    table.signature(templates).validate({"Row": rows})  # type: ignore
+    assert len(list(rows)) == 3
+    table.signature(templates).validate({"Row": lambda: "string", "Cell": [1]})  # type: ignore
+    table.signature(templates).validate({"Row": {"Cell": {"cell": (c for c in "ab")}}})
+
+
+def test_schema(templates: ruiner.Templates, table: ruiner.Template):
+    schema = table.signature(templates).schema
+    note = schema["Row"]["parameters"]["Note"]
+    assert schema["Row"]["parameters"]["Cell"] == {
+        "kind": "ref",
+        "optional": False,
+        "parameters": {
+            "cell": {"kind": "param", "optional": False},
+            "title": {"kind": "param", "optional": True},
+        },
+    }
+    assert (note["kind"], note["optional"]) == ("ref", True)
+    assert note["parameters"]["Note"]["parameters"] is note["parameters"]
+    assert ruiner.Template("<!-- (optional)(ref)x -->").signature().schema == {
+        "x": {"kind": "ref", "optional": True, "parameters": None}
+    }
+
+
+def test_optional():
+    signature = ruiner.Template("<!-- (optional)(param)a --><!-- (param)a -->\n<!-- (optional)(param)b -->").signature()
+    assert [(name, f.optional) for name, f in signature.parameters.items()] == [("a", False), ("b", True)]
+    assert not signature.references
+
+
+def test_complete(templates: ruiner.Templates, table: ruiner.Template):
+    validator = table.signature(templates).validator(complete=True)
+    validator({"Row": {"Cell": [{"cell": "1"}]}})
+    with pytest.raises(ruiner.InvalidParameters, match=r"Row\[1\]\.Cell: required parameter is missing"):
+        validator({"Row": [{"Cell": {"cell": "1"}}, {}]})
+    with pytest.raises(ruiner.InvalidParameters, match=r"Row\.Cell: required"):
+        validator({"Row": {}})
+    with pytest.raises(ruiner.InvalidParameters, match=r"Row\.Cell\.cell: required"):
+        validator({"Row": {"Cell": {}}})
+    with pytest.raises(ruiner.InvalidParameters, match="^Row: required"):
+        validator({})
+
+
+def test_defaulted():
+    templates = {"Self": ruiner.Template("<!-- (ref)Self -->\n<!-- (param)x -->")}
+    signature = ruiner.Template("<!-- (ref)Self -->\n<!-- (ref)Self -->").signature(templates)
+    signature.validate({})
+    with pytest.raises(ruiner.InvalidParameters, match="^Self.Self.Self: required"):
+        signature.validate({"Self": {"Self": {"x": "1"}, "x": "1"}}, complete=True)
+
+
+@dataclasses.dataclass(frozen=True)
+class Cell:
+    cell: str
+
+
+def test_objects(templates: ruiner.Templates, table: ruiner.Template):
+    signature = table.signature(templates)
+    signature.validate({"Row": {"Cell": [Cell("1"), {"cell": "2"}]}})
+    signature.validate({"Row": {"Cell": Cell("1")}})
+    with pytest.raises(ruiner.InvalidParameters, match=r"Row\.Cell\[0\]\.cell"):
+        signature.validate({"Row": {"Cell": [Cell(1)]}})  # type: ignore
+
+
+def test_bound(templates: ruiner.Templates):
+    bound = ruiner.Template("<!-- (param)a --><!-- (param)b -->").bind({"a": {}})  # type: ignore
+    with pytest.raises(TypeError):
+        bound.signature(templates).validate({"b": "1"})
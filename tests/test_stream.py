@@ -0,0 +1,40 @@
+import io
+
+import pytest
+
+import ruiner
+from ruiner.Renderer import Rows
+
+from .test_compiled import cases
+
+
+@pytest.mark.parametrize(("template", "parameters", "templates"), cases)
+def test_stream(template: str, parameters: ruiner.TemplateParameters, templates: ruiner.Templates):
+    assert "".join(ruiner.Template(template).stream(parameters, templates)) == ruiner.Template(template).rendered(
+        parameters, templates
+    )
+
+
+@pytest.mark.parametrize(("template", "parameters", "templates"), cases)
+def test_render_to(template: str, parameters: ruiner.TemplateParameters, templates: ruiner.Templates):
+    output = io.StringIO()
+    ruiner.Template(template).render_to(output, parameters, templates)
+    assert output.getvalue() == ruiner.Template(template).rendered(parameters, templates)
+
+
+def test_stream_lazy():
+    chunks = ruiner.Template("<!-- (ref)Row -->").stream(
+        {"Row": [{"cell": "1"}, {"cell": {}}]}, {"Row": ruiner.Template("<!-- (param)cell -->")}
+    )
+    assert next(chunks) == "1"
+    assert next(chunks) == "\n"
+    with pytest.raises(TypeError):
+        next(chunks)
+
+
+def test_stream_rows():
+    values = [str(i) for i in range(300000)]
+    template = ruiner.Template("<tr><!-- (param)a -->,<!-- (param)b --></tr>")
+    chunks = list(template.stream({"a": values, "b": values}))
+    assert len(chunks) == -(-len(values) // Rows.batch)
+    assert "".join(chunks) == template.rendered({"a": values, "b": values})
@@ -0,0 +1,98 @@
+import concurrent.futures
+import pathlib
+import sys
+import typing
+
+import pytest
+
+import ruiner
+
+
+@pytest.fixture(autouse=True)
+def _switching() -> typing.Iterator[None]:
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+@pytest.fixture
+def executor() -> typing.Iterator[concurrent.futures.Executor]:
+    with concurrent.futures.ThreadPoolExecutor(16) as result:
+        yield result
+
+
+def parameters(seed: int) -> ruiner.TemplateParameters:
+    return {"Row": [{"Cell": [{"cell": f"{seed % 7}.{x}.{y}"} for x in range(5)]} for y in range(20)]}
+
+
+def compared(
+    executor: concurrent.futures.Executor, render: "typing.Callable[[ruiner.TemplateParameters], typing.Any]"
+):
+    seeds = range(256)
+    return list(executor.map(lambda seed: render(parameters(seed)), seeds)), [render(parameters(s)) for s in seeds]
+
+
+def test_template(executor: concurrent.futures.Executor, table: ruiner.Template, templates: ruiner.Templates):
+    result, expected = compared(executor, lambda p: table.rendered(p, templates))
+    assert result == expected
+
+
+def test_cache(executor: concurrent.futures.Executor, table: ruiner.Template, templates: ruiner.Templates):
+    cache = ruiner.Cache(maxsize=16)
+    result, expected = compared(executor, lambda p: table.rendered(p, templates, cache=cache))
+    assert result == expected == [table.rendered(parameters(s), templates) for s in range(256)]
+    assert cache.stats.entries == len(cache.entries) <= 16
+
+
+def test_profile(executor: concurrent.futures.Executor, table: ruiner.Template, templates: ruiner.Templates):
+    profile = ruiner.Profile()
+    result, expected = compared(executor, lambda p: table.rendered(p, templates, profile=profile))
+    assert result == expected
+    assert {name: stats.calls for name, stats in profile.templates.items()} == {
+        "": 2 * 256,
+        "Row": 2 * 256 * 20,
+        "Cell": 2 * 256 * 100,
+    }
+    assert profile.templates[""].size == 2 * sum(map(len, expected))
+
+
+def test_budget(executor: concurrent.futures.Executor, table: ruiner.Template, templates: ruiner.Templates):
+    budget = ruiner.Budget(expansions=121)
+
+    def rendered(p: ruiner.TemplateParameters):
+        output = table.rendered(p, templates, budget=budget)
+        return output, budget.usage.size, budget.usage.expansions
+
+    result, expected = compared(executor, rendered)
+    assert result == expected
+    assert all(size == len(output) and expansions == 121 for output, size, expansions in result)
+    with pytest.raises(ruiner.BudgetExceeded):
+        table.rendered({"Row": [*parameters(0)["Row"], {}]}, templates, budget=budget)  # type: ignore
+
+
+def test_loader(executor: concurrent.futures.Executor, table: ruiner.Template, tmp_path: pathlib.Path):
+    (tmp_path / "Row.txt").write_text("<tr>\n    <!-- (ref)Cell -->\n</tr>")
+    (tmp_path / "Cell.txt").write_text("<td><!-- (param)cell --></td>")
+    loader = ruiner.TemplateLoader(tmp_path)
+    result, expected = compared(executor, lambda p: table.rendered(p, loader))
+    assert result == expected
+    assert set(loader.loaded) == {"Row", "Cell"}
+
+
+def test_set(executor: concurrent.futures.Executor, table: ruiner.Template, templates: ruiner.Templates):
+    linked = ruiner.TemplateSet({**templates, "Table": table})
+    result, expected = compared(executor, lambda p: linked.rendered("Table", p))
+    assert result == expected
+
+
+def test_compiled(executor: concurrent.futures.Executor, table: ruiner.Template, templates: ruiner.Templates):
+    compiled = table.compiled(templates)
+    result, expected = compared(executor, compiled.rendered)
+    assert result == expected == [table.rendered(parameters(s), templates) for s in range(256)]
+
+
+def test_incremental(executor: concurrent.futures.Executor, table: ruiner.Template, templates: ruiner.Templates):
+    incremental = ruiner.Incremental(table, templates)
+    result, expected = compared(executor, incremental.rendered)
+    assert result == expected == [table.rendered(parameters(s), templates) for s in range(256)]
@@ -0,0 +1,52 @@
+import dataclasses
+
+import pytest
+
+import ruiner
+from ruiner.Node import Invalid, Parameter, Reference, Row, Text, Tree, Wrapped
+
+
+def test_parsed():
+    assert ruiner.Template(
+        "lalala\n" "a<!-- (param)b -->c<!-- (optional)(param)d -->e\n" "\t<!-- (ref)f -->"
+    ).tree == Tree(
+        (
+            Text("lalala"),
+            Row(("a", "c", "e"), (Parameter("b", optional=False), Parameter("d", optional=True))),
+            Wrapped("\t", Reference("f", optional=False), ""),
+        )
+    )
+
+
+def test_parsed_invalid():
+    (line,) = ruiner.Template("<!-- (g)h -->").tree.lines
+    assert isinstance(line, Row)
+    assert line.literals == ("", "")
+    assert isinstance(line.slots[0], Invalid)
+
+
+@pytest.mark.parametrize(
+    "line",
+    ["<!-- (param -->", "<!-- ()a -->", "<!-- (param) -->", "<!-- (param)a ->", "<!-- (param)a", "<!-- param -->"],
+)
+def test_parsed_text(line: str):
+    assert ruiner.Template(line).tree == Tree((Text(line),))
+
+
+def test_invalid_position():
+    with pytest.raises(ValueError, match="at line 3, column 5"):
+        ruiner.Template("lalala\n\n    <!-- (unknown)x --><!-- (param)y -->").rendered({})
+
+
+def test_immutable():
+    tree = ruiner.Template("lalala").tree
+    assert not hasattr(tree, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        tree.lines = ()  # type: ignore
+
+
+def test_reference_rendered():
+    templates: ruiner.Templates = {"f": ruiner.Template("<!-- (param)x -->")}
+    renderer = ruiner.Renderer(templates)
+    assert Reference("f", optional=True).rendered({}, renderer) == [""]
+    assert Reference("f", optional=False).rendered({"f": [{"x": "1"}, {"x": "2"}]}, renderer) == ["1", "2"]